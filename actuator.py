@@ -0,0 +1,223 @@
+import math
+import threading
+import time
+from collections import deque
+
+
+class OneEuroFilter:
+    """One Euro low-pass filter for a single coordinate.
+
+    Smooths heavily while the hand is still and follows closely when it moves
+    fast, so jitter is removed without adding noticeable lag.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.02, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.value = None
+        self.derivative = 0.0
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self):
+        self.value = None
+        self.derivative = 0.0
+        self.timestamp = None
+
+    def __call__(self, value, timestamp):
+        """Filter one sample and return (filtered value, filtered derivative)."""
+        if self.value is None:
+            self.value, self.timestamp = value, timestamp
+            return value, 0.0
+
+        dt = max(timestamp - self.timestamp, 1e-6)
+        raw_derivative = (value - self.value) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self.derivative = a_d * raw_derivative + (1 - a_d) * self.derivative
+
+        cutoff = self.min_cutoff + self.beta * abs(self.derivative)
+        a = self._alpha(cutoff, dt)
+        self.value = a * value + (1 - a) * self.value
+        self.timestamp = timestamp
+        return self.value, self.derivative
+
+
+class PyAutoGuiBackend:
+    """Drive the real system cursor through pyautogui without its per-call PAUSE."""
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def size(self):
+        return self._pyautogui.size()
+
+    def move(self, x, y):
+        self._pyautogui.moveTo(x, y, _pause=False)
+
+    def click(self):
+        self._pyautogui.click(_pause=False)
+
+
+class NullBackend:
+    """Record cursor actions instead of performing them, for headless runs and tests."""
+
+    def __init__(self, width=1920, height=1080):
+        self.width = width
+        self.height = height
+        self.moves = deque(maxlen=1000)
+        self.clicks = 0
+
+    def size(self):
+        return self.width, self.height
+
+    def move(self, x, y):
+        self.moves.append((x, y))
+
+    def click(self):
+        self.clicks += 1
+
+
+BACKENDS = {
+    "pyautogui": PyAutoGuiBackend,
+    "null": NullBackend,
+}
+
+
+class CursorActuator:
+    """Apply cursor moves and clicks from a dedicated thread.
+
+    Move requests are coalesced so only the latest target is applied, at most
+    `rate_hz` times per second. Targets are smoothed with a One Euro filter,
+    optionally extrapolated `predict` seconds ahead, and moves smaller than
+    `min_move` pixels are skipped. With `measure=True` the delay between the
+    frame timestamp given to move_to() and the cursor update is recorded.
+    """
+
+    def __init__(self, backend=None, rate_hz=60, min_move=2, min_cutoff=1.0, beta=0.02,
+                 predict=0.0, measure=False):
+        self.backend = backend if backend is not None else PyAutoGuiBackend()
+        self.screen_width, self.screen_height = self.backend.size()
+        self.period = 1.0 / rate_hz
+        self.min_move = min_move
+        self.predict = predict
+        self.measure = measure
+        self.filter_x = OneEuroFilter(min_cutoff, beta)
+        self.filter_y = OneEuroFilter(min_cutoff, beta)
+
+        self.requested = 0
+        self.sent = 0
+        self.skipped = 0
+        self.clicks = 0
+        self.errors = 0  # Backend calls that raised; the thread keeps running
+        self.latencies = deque(maxlen=1000)
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._target = None
+        self._pending_clicks = 0
+        self._last_sent = None
+        self._thread = None
+        self.running = False
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def move_to(self, x, y, timestamp=None):
+        """Request a cursor move in screen pixels; only the latest request is kept."""
+        with self._lock:
+            self._target = (x, y, timestamp if timestamp is not None else time.perf_counter())
+            self.requested += 1
+        self._wake.set()
+
+    def move_normalized(self, x, y, timestamp=None):
+        """Request a cursor move from coordinates normalized to [0, 1]."""
+        self.move_to(x * self.screen_width, y * self.screen_height, timestamp)
+
+    def click(self):
+        """Request a click at the current cursor position."""
+        with self._lock:
+            self._pending_clicks += 1
+        self._wake.set()
+
+    def stats(self):
+        stats = {
+            "requested": self.requested,
+            "coalesced": self.requested - self.sent - self.skipped,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "clicks": self.clicks,
+            "errors": self.errors,
+        }
+        if self.measure and self.latencies:
+            latencies = sorted(self.latencies)
+            stats["latency_ms_p50"] = round(latencies[len(latencies) // 2] * 1000, 2)
+            stats["latency_ms_p95"] = round(latencies[int(len(latencies) * 0.95)] * 1000, 2)
+        return stats
+
+    def _run(self):
+        next_tick = time.perf_counter()
+        while self.running:
+            self._wake.wait()
+            self._wake.clear()
+
+            # Never update faster than the refresh rate
+            now = time.perf_counter()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+            next_tick = max(now, next_tick) + self.period
+
+            with self._lock:
+                target, self._target = self._target, None
+                clicks, self._pending_clicks = self._pending_clicks, 0
+
+            try:
+                if target is not None:
+                    self._apply_move(*target)
+                for _ in range(clicks):
+                    self.backend.click()
+                    self.clicks += 1
+            except Exception as e:
+                # A failing backend must not silently end cursor control
+                if not self.errors:
+                    print(f"Cursor backend error: {e!r}")
+                self.errors += 1
+
+    def _apply_move(self, x, y, timestamp):
+        now = time.perf_counter()
+        x, dx = self.filter_x(x, now)
+        y, dy = self.filter_y(y, now)
+        if self.predict:
+            x += dx * self.predict
+            y += dy * self.predict
+
+        # Stay one pixel inside the edges: pyautogui's fail-safe fires when the cursor reaches a corner
+        x = int(min(max(x, 1), self.screen_width - 2))
+        y = int(min(max(y, 1), self.screen_height - 2))
+
+        # Skip moves too small to matter
+        if self._last_sent is not None:
+            last_x, last_y = self._last_sent
+            if abs(x - last_x) < self.min_move and abs(y - last_y) < self.min_move:
+                self.skipped += 1
+                return
+
+        self.backend.move(x, y)
+        self._last_sent = (x, y)
+        self.sent += 1
+        if self.measure:
+            self.latencies.append(time.perf_counter() - timestamp)
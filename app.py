@@ -1,24 +1,59 @@
 import tkinter as tk
 from tkinter import filedialog
-import pyautogui
 import cv2
-from mediapipe.tasks.python import vision
-from mediapipe.tasks.python import BaseOptions
-import mediapipe as mp
+import os
 import threading
+import time
+import argparse
+import numpy as np
 from math import sqrt
-from PIL import Image, ImageTk, ImageDraw
+from preview import PreviewBridge
+from pipeline import GesturePipeline
+from actuator import BACKENDS, CursorActuator
+from frame_source import open_source
+from camera import add_camera_arguments, camera_options
+from recognition import LazyRecognizer, hands_from_result, recognize_rgb
+from recognizer_profiles import load_profile, recognizer_options
+from metrics import metrics
+from landmark_classifier import LandmarkClassifier
+from roi import RoiTracker, downscale
+from idle import IdleController
+from dispatch import Action, GestureDispatcher
+from document import DocumentView, LineIndex
+from recognition_cache import RecognitionCache
+from hand_geometry import FINGER_TIPS, WRIST, palm_centroid
 
 # Path to your trained .task file for gesture recognition
 task_file = "custom_gestures.task"
 
-# Gesture Recognizer Configuration
-base_options = BaseOptions(model_asset_path=task_file)
-gesture_recognizer_options = vision.GestureRecognizerOptions(base_options=base_options)
-gesture_recognizer = vision.GestureRecognizer.create_from_options(gesture_recognizer_options)
+# Gesture Recognizer Configuration; loaded and warmed up on a background thread so the window opens at once.
+# Replaced in __main__ when --profile picks other settings.
+recognizer_profile = {}
+gesture_recognizer = LazyRecognizer(task_file)
 
-# Screen dimensions
-screen_width, screen_height = pyautogui.size()
+
+# Labels from the landmark dataset mapped to the gestures the reader acts on
+CLASSIFIER_GESTURES = {
+    "scrollUP_start": "scroll_up",
+    "scrollUP_finish": "scroll_up",
+    "scrollDOWN_start": "scroll_down",
+    "scrollDOWN_finish": "scroll_down",
+}
+
+# Gesture -> action table for the reader. Scrolls held across frames are
+# coalesced into one larger scroll at most every 150 ms.
+READER_ACTIONS = {
+    "open_palm": Action("move_cursor", continuous=True),
+    "pinch": Action("click"),
+    "scroll_up": Action("scroll_up", repeat=0.15, coalesce=True),
+    "scroll_down": Action("scroll_down", repeat=0.15, coalesce=True),
+    "scroll_right": Action("scroll_right", repeat=0.15, coalesce=True),
+    "scroll_left": Action("scroll_left", repeat=0.15, coalesce=True),
+    "idle": Action("idle"),
+}
+
+# Landmark indices used for the palm centroid: wrist, index tip, middle finger tip
+PALM_POINTS = [WRIST] + FINGER_TIPS[:2]
 
 
 # Distance function
@@ -28,8 +63,23 @@ def distance(x1, y1, x2, y2):
 
 # Tkinter Interface
 class GestureReaderApp:
-    def __init__(self, root):
+    def __init__(self, root, pipelined=False, actuator=None, preview_fps=15, source=0, metrics_overlay=False,
+                 classifier=None, tracker=None, idle=None, votes=2, votes_window=3, large_file_mb=8,
+                 cache=None, camera=None):
         self.root = root
+        self.source = source  # Webcam index, video file, image directory or array stream
+        self.camera = camera  # Format, resolution and FPS requested from a webcam
+        self.pipelined = pipelined  # Run capture, recognition and actuation as separate stages
+        self.classifier = classifier  # Optional landmark classifier used instead of the gesture head
+        self.tracker = tracker  # Optional ROI tracker that crops and downscales frames before recognition
+        self.idle = idle  # Optional idle controller that lowers the recognition rate when nobody is there
+        self.cache = cache  # Optional RecognitionCache reused for near-duplicate frames (sequential mode)
+        self.large_file_bytes = large_file_mb * 1024 * 1024  # Files this big are shown through a line window
+        self.document = None  # DocumentView while a large file is open
+
+        # Cursor moves and clicks are applied from the actuator's own thread
+        self.actuator = actuator if actuator is not None else CursorActuator()
+        self.actuator.start()
         self.root.title("Gesture-Based Reader")
         self.root.attributes('-fullscreen', True)  # Open in full-screen mode
 
@@ -90,6 +140,11 @@ class GestureReaderApp:
         self.gesture_label = tk.Label(root, textvariable=self.current_gesture, font=("Arial", 14))
         self.gesture_label.pack(pady=5)
 
+        # Indexing progress and line count of a large document
+        self.document_status = tk.StringVar(value="")
+        self.document_label = tk.Label(root, textvariable=self.document_status, font=("Arial", 10))
+        self.document_label.pack()
+
         # Small Camera Canvas
         self.camera_frame = tk.Frame(root)
         self.camera_frame.pack(side=tk.LEFT, padx=10, pady=10, anchor="sw")
@@ -97,6 +152,22 @@ class GestureReaderApp:
         self.canvas = tk.Canvas(self.camera_frame, width=200, height=150)
         self.canvas.pack()
 
+        # The webcam thread never touches Tk directly; the preview bridge applies its updates
+        self.preview = PreviewBridge(root, self.canvas, self.current_gesture, size=(200, 150), fps=preview_fps)
+        self.preview.start()
+
+        # Optional on-screen overlay with per-stage timings and counters
+        self.metrics_text = None
+        if metrics_overlay:
+            self.metrics_text = tk.StringVar()
+            self.metrics_label = tk.Label(self.camera_frame, textvariable=self.metrics_text,
+                                          font=("Courier", 10), justify=tk.LEFT, anchor="w")
+            self.metrics_label.pack(fill="x")
+            self.root.after(500, self.update_metrics_overlay)
+
+        # Debounces gestures and rate-limits the actions they trigger; clicks fire once per pinch
+        self.dispatcher = GestureDispatcher(READER_ACTIONS, window=votes_window, votes=votes)
+
         # Webcam Thread
         self.running = True
         self.cap = None  # Initialize OpenCV video capture object
@@ -104,9 +175,6 @@ class GestureReaderApp:
         self.webcam_thread.daemon = True  # Ensure thread stops with the app
         self.webcam_thread.start()
 
-        # State to prevent click spamming
-        self.click_detected = False
-
     def create_button(self, text, command, col):
         """Create a button with hover and click feedback."""
         button = tk.Button(
@@ -130,16 +198,44 @@ class GestureReaderApp:
 
 
     def load_file(self):
-        """Load a text file into the text widget."""
-        file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt")])
+        """Load a text file into the text widget; large files are memory-mapped and shown a window at a time."""
+        file_path = filedialog.askopenfilename(filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")])
         if file_path:
+            if self.document is not None:
+                self.document.close()
+                self.document = None
             try:
+                if os.path.getsize(file_path) >= self.large_file_bytes:
+                    self.document = DocumentView(self.text_area, self.v_scrollbar, LineIndex(file_path).start())
+                    self.document_status.set("Indexing...")
+                    self.root.after(50, self.update_document, self.document)
+                    return
                 with open(file_path, "r", encoding="utf-8") as file:
                     self.text_area.delete(1.0, tk.END)
                     self.text_area.insert(tk.END, file.read())  
+                self.document_status.set("")
             except Exception as e:
                 print(f"Error loading file: {e}")
 
+    def update_document(self, document):
+        """Report indexing progress and keep the line window around the view, e.g. after wheel scrolling."""
+        if document is not self.document or not self.running:
+            return
+        document.refresh()
+        index = document.index
+        if index.done.is_set():
+            self.document_status.set(f"{index.line_count:,} lines")
+        else:
+            self.document_status.set(f"Indexing {index.progress:.0%} ({index.line_count:,} lines)")
+        self.root.after(100, self.update_document, document)
+
+    def scroll_text(self, units):
+        """Scroll the text vertically, through the line window when a large document is open."""
+        if self.document is not None:
+            self.document.yview_scroll(units, "units")
+        else:
+            self.text_area.yview_scroll(units, "units")
+
     def increase_font(self):
         """Increase the font size of the text."""
         self.font_size += 2
@@ -153,99 +249,186 @@ class GestureReaderApp:
 
     def process_webcam(self):
         """Process gestures and display the camera feed on the canvas."""
-        self.cap = cv2.VideoCapture(0)
+        self.cap = open_source(self.source, camera=self.camera)
         if not self.cap.isOpened():
             print("Error: Webcam not initialized.")
             return
 
-        hands = mp.solutions.hands.Hands()
+        if self.pipelined:
+            self.run_pipeline()
+            return
+
+        gesture_recognizer.start()
+        was_ready = False
         while self.running:
-            ret, frame = self.cap.read()
+            with metrics.timer("read"):
+                ret, frame = self.cap.read()
             if not ret:
-                continue
+                if not self.cap.live:  # End of a recorded clip
+                    break
+                continue  # A webcam read waits for the next frame, so this does not spin
+            if hasattr(self.cap, "frame_age"):
+                metrics.observe("frame_age", self.cap.frame_age)
+
+            captured_at = time.perf_counter()
+            metrics.inc("frames_received")
 
             # Prepare the frame for Mediapipe
-            frame = cv2.flip(frame, 1)
-            frame_height, frame_width, _ = frame.shape
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            output = hands.process(rgb_frame)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-
-            result = gesture_recognizer.recognize(mp_image)
-            if result.gestures:
-                    gesture = result.gestures[0][0].category_name
-
-            if output.multi_hand_landmarks:
-                for hand in output.multi_hand_landmarks:
-                    hand_landmarks = hand.landmark
-                    wrist_x = wrist_y = index_x = index_y = middle_x = middle_y = 0
-
-                    for i, landmark in enumerate(hand_landmarks):
-                        x = int(landmark.x * frame_width)
-                        y = int(landmark.y * frame_height)
-
-                        if i == 0:  # Wrist
-                            wrist_x, wrist_y = x, y
-                        if i == 8:  # Index tip
-                            index_x, index_y = x, y
-                        if i == 12:  # Middle finger tip
-                            middle_x, middle_y = x, y
-
-                    # Cursor movement with an open palm
-                    if gesture == "open_palm":
-                        palm_x = (wrist_x + index_x + middle_x) // 3
-                        palm_y = (wrist_y + index_y + middle_y) // 3
-                        screen_x = int((screen_width / frame_width) * palm_x)
-                        screen_y = int((screen_height / frame_height) * palm_y)
-                        pyautogui.moveTo(screen_x, screen_y)
-
-                        self.current_gesture.set("Cursor Movement")
-
-                    # Simulate a click with pinch gesture (index tip close to middle tip)
-                    if gesture == "pinch":
-                        if not self.click_detected:
-                            pyautogui.click()
-                            self.click_detected = True
-                            self.current_gesture.set("Click")
-                    else:
-                        self.click_detected = False
-                    
-                    if gesture == "scroll_up" :
-                        self.text_area.yview_scroll(-3, "units")  # Scroll up 3 units
-                        self.current_gesture.set("Scroll Up")
-
-                    if gesture == "scroll_down":
-                        self.text_area.yview_scroll(3, "units")  # Scroll down 3 units
-                        self.current_gesture.set("Scroll Down")
-
-
-                    if gesture == "scroll_right":
-                        self.text_area.xview_scroll(3, "units")  # Scroll right 3 units
-                        self.current_gesture.set("Scroll to Right")
-
-                    if gesture == "scroll_left":
-                        self.text_area.xview_scroll(-3, "units")  # Scroll left 3 units
-                        self.current_gesture.set("Scroll to Left")
-
-                    if gesture == "idle":
-                        self.current_gesture.set("Idle")
-              
-
-
-            # Resize and display the camera feed
-            resized_frame = cv2.resize(rgb_frame, (200, 150))
-            img = Image.fromarray(resized_frame)
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.canvas.create_image(0, 0, anchor=tk.NW, image=imgtk)
-            self.canvas.image = imgtk  # Keep reference to avoid garbage collection
+            with metrics.timer("prepare"):
+                frame = cv2.flip(frame, 1)
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+            # Keep the preview live while the model is still loading
+            if not gesture_recognizer.ready:
+                failed = gesture_recognizer.state == "error"
+                self.preview.set_label("Gesture model failed to load" if failed else "Loading gesture model...")
+                self.show_preview(rgb_frame)
+                continue
+            if not was_ready:
+                # Replace the loading message as soon as the model is usable
+                self.preview.set_label("No Gesture Detected")
+                was_ready = True
+
+            if self.idle is None or self.idle.should_recognize(rgb_frame):
+                hands = self.recognize(rgb_frame)
+                self.handle_hands(hands, captured_at)
+            self.show_preview(rgb_frame)
 
         self.cap.release()
         cv2.destroyAllWindows()
 
+    def recognize(self, rgb_frame):
+        """Recognize hands in a frame, on a tracked crop when ROI tracking is enabled."""
+        if self.tracker is None:
+            # Landmarks are normalized, so a frame shrunk by the profile needs no rescaling afterwards
+            hands, _ = self.recognize_cached(downscale(rgb_frame, recognizer_profile.get("max_side")))
+            return hands
+
+        with metrics.timer("crop"):
+            model_input, box = self.tracker.prepare(rgb_frame)
+        hands, inference_seconds = self.recognize_cached(model_input)
+        return self.tracker.finish(hands, box, inference_seconds)
+
+    def recognize_cached(self, rgb_frame):
+        """Return (hands, inference seconds); near-duplicate frames reuse a cached result and report None seconds."""
+        fingerprint = None
+        if self.cache is not None:
+            with metrics.timer("cache_lookup"):
+                result, fingerprint = self.cache.get(rgb_frame)
+            metrics.inc("recognition_cache", outcome="miss" if result is None else "hit")
+            if result is not None:
+                return hands_from_result(result), None
+
+        start = time.perf_counter()
+        result = recognize_rgb(gesture_recognizer.get(), rgb_frame)
+        inference_seconds = time.perf_counter() - start
+        metrics.observe("recognize", inference_seconds)
+        if self.cache is not None:
+            self.cache.put(fingerprint, result)
+        return hands_from_result(result), inference_seconds
+
+    def run_pipeline(self):
+        """Run the LIVE_STREAM pipeline until the app is closed."""
+        gate = self.idle.should_recognize if self.idle is not None else None
+        pipeline = GesturePipeline(self.cap.read, self.on_recognition, recognizer_profile.get("model") or task_file,
+                                   gate=gate, options=recognizer_options(recognizer_profile), live=self.cap.live)
+        pipeline.start()
+        while self.running and not pipeline.finished.is_set():
+            time.sleep(0.1)
+        pipeline.stop()
+        print(f"Pipeline stats: {pipeline.stats()}")
+
+    def on_recognition(self, result, rgb_frame, captured_at):
+        """Handle a recognizer result delivered by the pipeline's actuation stage."""
+        self.handle_hands(hands_from_result(result), captured_at)
+        self.show_preview(rgb_frame)
+
+    def show_preview(self, rgb_frame):
+        """Hand the camera frame to the preview bridge for display."""
+        self.preview.publish_frame(rgb_frame)
+
+    def update_metrics_overlay(self):
+        """Refresh the metrics overlay from the main loop."""
+        if not self.running:
+            return
+        snapshot = metrics.snapshot()
+        lines = [f"{stage:<10} p50 {stats.get('p50', 0):6.1f} p95 {stats.get('p95', 0):6.1f} ms"
+                 for stage, stats in snapshot["stages"].items()]
+        lines += [f"{name}: {count}" for name, count in sorted(snapshot["counters"].items())]
+        self.metrics_text.set("\n".join(lines))
+        self.root.after(500, self.update_metrics_overlay)
+
+    def handle_hands(self, hands, captured_at):
+        """Act on every hand found in one frame."""
+        if hands and self.classifier is not None:
+            with metrics.timer("classify"):
+                labels, scores = self.classifier.predict_batch(np.stack([points for _, _, points in hands]))
+            hands = [(CLASSIFIER_GESTURES.get(label, label), score, points)
+                     for label, score, (_, _, points) in zip(labels, scores, hands)]
+
+        if self.idle is not None:
+            self.idle.observe([gesture for gesture, _, _ in hands])
+
+        if hands:
+            metrics.inc("frames_with_hands")
+            for gesture, _, _ in hands:
+                metrics.inc("gestures", gesture=gesture)
+
+        # The first hand drives the reader
+        gesture, score, points = hands[0] if hands else (None, 0.0, None)
+        with metrics.timer("actuate"):
+            for action, steps in self.dispatcher.update(gesture, score):
+                metrics.inc("actions", action=action)
+                self.handle_action(action, steps, points, captured_at)
+
+    def handle_action(self, action, steps, points, captured_at=None):
+        """Run one action from the dispatcher; steps counts coalesced repeats."""
+        # Cursor movement with an open palm
+        if action == "move_cursor" and points is not None:
+            # Average wrist, index tip and middle tip
+            palm_x, palm_y = palm_centroid(points[None], PALM_POINTS)[0]
+            self.actuator.move_normalized(palm_x, palm_y, captured_at)
+            self.preview.set_label("Cursor Movement")
+
+        # Simulate a click with pinch gesture (index tip close to middle tip)
+        if action == "click":
+            self.actuator.click()
+            self.preview.set_label("Click")
+
+        if action == "scroll_up":
+            self.preview.post(self.scroll_text, -3 * steps)  # Scroll up 3 units per step
+            self.preview.set_label("Scroll Up")
+
+        if action == "scroll_down":
+            self.preview.post(self.scroll_text, 3 * steps)  # Scroll down 3 units per step
+            self.preview.set_label("Scroll Down")
+
+        if action == "scroll_right":
+            self.preview.post(self.text_area.xview_scroll, 3 * steps, "units")  # Scroll right 3 units per step
+            self.preview.set_label("Scroll to Right")
+
+        if action == "scroll_left":
+            self.preview.post(self.text_area.xview_scroll, -3 * steps, "units")  # Scroll left 3 units per step
+            self.preview.set_label("Scroll to Left")
+
+        if action == "idle":
+            self.preview.set_label("Idle")
+
     def on_close(self):
         """Handle cleanup and close the application."""
         self.running = False  # Stop the webcam thread loop
+        self.preview.stop()
+        self.actuator.stop()
+        print(f"Actuator stats: {self.actuator.stats()}")
+        if not self.pipelined:
+            print(f"Recognizer: {gesture_recognizer.status()}")
+        if self.cache is not None:
+            print(f"Recognition cache: {self.cache.stats()}")
+        if self.document is not None:
+            self.document.close()
         if self.cap:
+            if hasattr(self.cap, "stats"):
+                print(f"Camera stats: {self.cap.stats()}")
             self.cap.release()  # Release the camera resource
         if self.webcam_thread.is_alive():
             print("Stopping webcam thread...")
@@ -256,7 +439,75 @@ class GestureReaderApp:
 
 # Run the App
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gesture-based text reader")
+    parser.add_argument("--source", default="0",
+                        help="webcam index, video file or directory of images to read frames from")
+    add_camera_arguments(parser)
+    parser.add_argument("--profile", default="default",
+                        help="recognizer profile, e.g. low-latency or accurate-two-hand (see recognizer_profiles.py)")
+    parser.add_argument("--profile-file", help="JSON file with more recognizer profiles")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="run capture, LIVE_STREAM recognition and actuation on separate threads")
+    parser.add_argument("--actuator", choices=sorted(BACKENDS), default="pyautogui",
+                        help="cursor output backend ('null' only records moves)")
+    parser.add_argument("--predict-ms", type=float, default=0.0,
+                        help="extrapolate the smoothed cursor this many milliseconds ahead")
+    parser.add_argument("--measure-latency", action="store_true",
+                        help="report gesture-to-cursor latency on exit")
+    parser.add_argument("--preview-fps", type=float, default=15,
+                        help="maximum refresh rate of the camera preview")
+    parser.add_argument("--classifier",
+                        help="landmark classifier model (.npz from landmark_classifier.py) to use instead of the gesture head")
+    parser.add_argument("--track", action="store_true",
+                        help="crop frames to the tracked hand and adapt the input resolution (sequential mode only)")
+    parser.add_argument("--target-fps", type=float, default=30,
+                        help="frame rate the adaptive input resolution aims for when tracking")
+    parser.add_argument("--idle-after", type=int, default=0,
+                        help="frames without a hand (or with only 'idle') before dropping to the idle rate; 0 disables")
+    parser.add_argument("--idle-interval", type=float, default=1.0,
+                        help="seconds between recognitions while idle (worst-case wake-up without motion)")
+    parser.add_argument("--motion-threshold", type=float, default=6.0,
+                        help="mean thumbnail pixel change that counts as motion and wakes recognition")
+    parser.add_argument("--votes", type=int, default=2,
+                        help="frames out of --votes-window a gesture must win before it acts")
+    parser.add_argument("--votes-window", type=int, default=3,
+                        help="number of recent frames considered when voting on the gesture")
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse results for near-identical frames (sequential mode only)")
+    parser.add_argument("--cache-tolerance", type=float, default=2.0,
+                        help="mean thumbnail pixel difference under which a frame reuses a cached result")
+    parser.add_argument("--cache-max-age", type=float, default=0.5,
+                        help="seconds a result may be reused before the frame is recognized again")
+    parser.add_argument("--cache-size", type=int, default=16, help="cached results kept")
+    parser.add_argument("--large-file-mb", type=float, default=8,
+                        help="files at least this many MB are memory-mapped and shown a window of lines at a time")
+    parser.add_argument("--metrics-overlay", action="store_true",
+                        help="show per-stage timings and frame counters under the camera preview")
+    args = parser.parse_args()
+
+    try:
+        recognizer_profile = load_profile(args.profile, args.profile_file)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    gesture_recognizer = LazyRecognizer(recognizer_profile.get("model") or task_file,
+                                        options=recognizer_options(recognizer_profile))
+
+    # Start loading the model before building the UI; the pipeline builds its own LIVE_STREAM recognizer
+    if not args.pipelined:
+        gesture_recognizer.start()
+
+    classifier = LandmarkClassifier.load(args.classifier) if args.classifier else None
+    tracker = RoiTracker(target_fps=args.target_fps) if args.track else None
+    idle = IdleController(args.idle_after, args.idle_interval, args.motion_threshold) if args.idle_after else None
+    cache = RecognitionCache(args.cache_size, args.cache_tolerance, args.cache_max_age) if args.cache else None
+    actuator = CursorActuator(BACKENDS[args.actuator](), predict=args.predict_ms / 1000,
+                              measure=args.measure_latency)
+
     root = tk.Tk()
-    app = GestureReaderApp(root)
+    app = GestureReaderApp(root, pipelined=args.pipelined, actuator=actuator, preview_fps=args.preview_fps,
+                           source=args.source, metrics_overlay=args.metrics_overlay,
+                           classifier=classifier, tracker=tracker, idle=idle,
+                           votes=args.votes, votes_window=args.votes_window, large_file_mb=args.large_file_mb, cache=cache,
+                           camera=camera_options(args))
     root.protocol("WM_DELETE_WINDOW", app.on_close)
     root.mainloop()
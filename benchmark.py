@@ -0,0 +1,131 @@
+"""Replay recorded clips through the recognition path and report timings.
+
+Clips can be video files or directories of images, so the benchmark runs on
+machines without a camera:
+
+    python benchmark.py clips/scroll.mp4 clips/palm/ --json bench.json
+    python benchmark.py clips/scroll.mp4 --realtime
+
+The JSON report holds throughput, per-stage latency percentiles and the
+recognized gesture sequence, so runs from two commits can be diffed.
+"""
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from frame_source import open_source
+from recognition import create_recognizer, hands_from_result, recognize_rgb
+
+STAGES = ("read", "prepare", "recognize", "postprocess")
+
+
+def percentiles(samples):
+    """Summarize stage timings (in seconds) as millisecond percentiles."""
+    if not samples:
+        return {}
+    ms = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"mean": round(float(ms.mean()), 3), "p50": round(float(p50), 3),
+            "p95": round(float(p95), 3), "p99": round(float(p99), 3)}
+
+
+def gesture_runs(sequence):
+    """Collapse a per-frame gesture sequence into [gesture, frame count] runs."""
+    runs = []
+    for gesture in sequence:
+        if runs and runs[-1][0] == gesture:
+            runs[-1][1] += 1
+        else:
+            runs.append([gesture, 1])
+    return runs
+
+
+def run_clip(recognizer, path, realtime=False, limit=None):
+    """Replay one clip and return its report."""
+    source = open_source(path)
+    if not source.isOpened():
+        raise SystemExit(f"Error: could not open {path}")
+
+    timings = {stage: [] for stage in STAGES}
+    sequence = []
+    frames = 0
+    frame_interval = 1.0 / source.fps
+    started = time.perf_counter()
+
+    while limit is None or frames < limit:
+        # In real-time mode, wait until the frame would have arrived from a camera
+        if realtime:
+            delay = started + frames * frame_interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        t0 = time.perf_counter()
+        ret, frame = source.read()
+        t1 = time.perf_counter()
+        if not ret:
+            break
+
+        frame = cv2.flip(frame, 1)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        t2 = time.perf_counter()
+
+        result = recognize_rgb(recognizer, rgb_frame)
+        t3 = time.perf_counter()
+
+        hands = hands_from_result(result)
+        t4 = time.perf_counter()
+
+        for stage, duration in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            timings[stage].append(duration)
+        sequence.append(hands[0][0] if hands else None)
+        frames += 1
+
+    elapsed = time.perf_counter() - started
+    source.release()
+
+    return {
+        "source": path,
+        "frames": frames,
+        "frames_with_hands": sum(gesture is not None for gesture in sequence),
+        "seconds": round(elapsed, 3),
+        "fps": round(frames / elapsed, 2) if elapsed else 0.0,
+        "stages": {stage: percentiles(samples) for stage, samples in timings.items()},
+        "gestures": gesture_runs(sequence),
+    }
+
+
+def print_report(report):
+    print(f"{report['source']}: {report['frames']} frames in {report['seconds']} s "
+          f"({report['fps']} FPS, {report['frames_with_hands']} with hands)")
+    for stage, stats in report["stages"].items():
+        if stats:
+            print(f"  {stage:<12} p50 {stats['p50']:8.3f} ms  p95 {stats['p95']:8.3f} ms  p99 {stats['p99']:8.3f} ms")
+    print("  gestures: " + ", ".join(f"{gesture} x{count}" for gesture, count in report["gestures"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay clips through the gesture recognition path")
+    parser.add_argument("clips", nargs="+", help="video files or directories of images")
+    parser.add_argument("--model", default="custom_gestures.task", help="gesture recognizer .task bundle")
+    parser.add_argument("--realtime", action="store_true", help="pace frames at the clip's frame rate")
+    parser.add_argument("--limit", type=int, help="stop each clip after this many frames")
+    parser.add_argument("--json", help="write the report to this file")
+    args = parser.parse_args()
+
+    recognizer = create_recognizer(args.model)
+    reports = [run_clip(recognizer, clip, args.realtime, args.limit) for clip in args.clips]
+    recognizer.close()
+
+    for report in reports:
+        print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"model": args.model, "realtime": args.realtime, "clips": reports}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
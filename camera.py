@@ -0,0 +1,175 @@
+import threading
+import time
+
+import cv2
+
+
+class Camera:
+    """Webcam capture that always hands out the newest frame.
+
+    The requested pixel format, resolution and frame rate are negotiated when
+    the device opens, and the driver buffer is set to one frame. A background
+    thread grabs continuously so frames never queue up in the driver; read()
+    waits for the next fresh frame instead of returning a stale one. When the
+    device fails, it is reopened with exponential backoff.
+
+    Has the cv2.VideoCapture interface used by the scripts (`isOpened`,
+    `read`, `release`) plus `fps` and `live`, like the frame_source classes.
+    """
+
+    live = True
+
+    def __init__(self, index=0, width=None, height=None, fps=None, fourcc="MJPG", read_timeout=1.0,
+                 max_backoff=5.0):
+        self.index = index
+        self.width = width
+        self.height = height
+        self.requested_fps = fps
+        self.fourcc = fourcc
+        self.read_timeout = read_timeout
+        self.max_backoff = max_backoff
+
+        self.fps = fps or 30.0  # Negotiated rate once the device is open
+        self.negotiated = {}
+        self.measured_fps = 0.0
+        self.frame_age = 0.0  # Seconds between grabbing and handing out the last frame read
+        self.reconnects = 0
+        self.failed_grabs = 0
+        self.skipped = 0  # Frames grabbed but replaced before anyone read them
+
+        self._capture = None
+        self._frame = None
+        self._grabbed_at = 0.0
+        self._sequence = 0
+        self._last_read = 0
+        self._condition = threading.Condition()
+        self._running = False
+        self._stopped = threading.Event()  # Set by release(); wakes a reconnect backoff early
+        self._thread = None
+        self._opened = self._open()
+        if self._opened:
+            self._running = True
+            self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+            self._thread.start()
+
+    def _open(self):
+        capture = cv2.VideoCapture(self.index)
+        if not capture.isOpened():
+            capture.release()
+            return False
+        if self.fourcc:
+            capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width:
+            capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.requested_fps:
+            capture.set(cv2.CAP_PROP_FPS, self.requested_fps)
+        capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        # Drivers may pick something else; report what was actually granted
+        code = int(capture.get(cv2.CAP_PROP_FOURCC))
+        self.negotiated = {
+            "fourcc": "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)) if code else None,
+            "width": int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": capture.get(cv2.CAP_PROP_FPS),
+        }
+        self.fps = self.negotiated["fps"] or self.fps
+        self._capture = capture
+        return True
+
+    def _reconnect(self):
+        """Reopen the device, backing off exponentially while it keeps failing."""
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+        delay = 0.1
+        while self._running:
+            if self._stopped.wait(delay):
+                return
+            if self._open():
+                if not self._running:
+                    # release() ran while the device was opening; don't leak it
+                    self._capture.release()
+                    self._capture = None
+                    return
+                self.reconnects += 1
+                return
+            delay = min(delay * 2, self.max_backoff)
+
+    def _grab_loop(self):
+        failures = 0
+        last_grab = None
+        while self._running:
+            if self._capture is None or not self._capture.grab():
+                failures += 1
+                self.failed_grabs += 1
+                # A few dropped grabs are normal; after that assume the device is gone
+                if failures >= 5:
+                    self._reconnect()
+                    failures = 0
+                else:
+                    time.sleep(0.01)
+                continue
+            failures = 0
+            now = time.perf_counter()
+            ok, frame = self._capture.retrieve()
+            if not ok:
+                continue
+
+            if last_grab is not None:
+                interval = now - last_grab
+                rate = 1.0 / interval if interval > 0 else 0.0
+                self.measured_fps = rate if not self.measured_fps else self.measured_fps * 0.9 + rate * 0.1
+            last_grab = now
+
+            with self._condition:
+                if self._sequence > self._last_read:
+                    self.skipped += 1
+                self._frame = frame
+                self._grabbed_at = now
+                self._sequence += 1
+                self._condition.notify_all()
+
+    def isOpened(self):
+        return self._opened and self._running
+
+    def read(self):
+        """Wait for a frame newer than the last one read; returns (False, None) after read_timeout."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._sequence > self._last_read or not self._running,
+                                            self.read_timeout) or not self._running:
+                return False, None
+            self._last_read = self._sequence
+            self.frame_age = time.perf_counter() - self._grabbed_at
+            return True, self._frame
+
+    def stats(self):
+        return {"negotiated": self.negotiated, "measured_fps": round(self.measured_fps, 1),
+                "frame_age_ms": round(self.frame_age * 1000, 1), "reconnects": self.reconnects,
+                "failed_grabs": self.failed_grabs, "skipped": self.skipped}
+
+    def release(self):
+        self._running = False
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        if self._capture is not None:
+            self._capture.release()
+            self._capture = None
+
+
+def add_camera_arguments(parser):
+    """Add the webcam negotiation options shared by the capture scripts."""
+    parser.add_argument("--width", type=int, help="requested webcam frame width")
+    parser.add_argument("--height", type=int, help="requested webcam frame height")
+    parser.add_argument("--camera-fps", type=float, help="requested webcam frame rate")
+    parser.add_argument("--fourcc", default="MJPG", help="requested webcam pixel format, e.g. MJPG or YUYV ('' for the default)")
+
+
+def camera_options(args):
+    """Camera keyword arguments for open_source(camera=...) from parsed add_camera_arguments() options."""
+    return {"width": args.width, "height": args.height, "fps": args.camera_fps, "fourcc": args.fourcc or None}
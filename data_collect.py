@@ -1,7 +1,88 @@
 import cv2
 import mediapipe as mp
-import csv
 import os
+import argparse
+import queue
+import threading
+import numpy as np
+from camera import add_camera_arguments, camera_options
+from frame_source import open_source
+from landmark_dataset import LandmarkDatasetWriter
+from roi import hand_bbox
+
+
+class ImageWriter:
+    """Encode and save images on background threads behind a bounded queue.
+
+    save() never blocks the capture loop: when the queue is full the image
+    is dropped and counted instead.
+    """
+
+    def __init__(self, workers=2, queue_size=256):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0  # Images that could not be encoded or written
+        self.max_lag = 0  # Deepest the queue got, in images
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def save(self, path, image):
+        try:
+            self.queue.put_nowait((path, image))
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.max_lag = max(self.max_lag, self.queue.qsize())
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            path, image = item
+            try:
+                ok = cv2.imwrite(path, image)
+            except Exception:  # e.g. an empty crop at the frame edge
+                ok = False
+            with self._lock:
+                if ok:
+                    self.written += 1
+                else:
+                    self.failed += 1
+
+    def close(self):
+        """Finish writing everything that was queued."""
+        for _ in self._threads:
+            # Only wait for room while a writer is still there to make it
+            while any(thread.is_alive() for thread in self._threads):
+                try:
+                    self.queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+        for thread in self._threads:
+            thread.join()
+
+
+parser = argparse.ArgumentParser(description="Record cropped hand images for training")
+parser.add_argument("--source", default="0", help="webcam index, video file or directory of images")
+add_camera_arguments(parser)
+parser.add_argument("--labels", help="comma-separated gesture labels, selected with keys 1-9 while capturing")
+parser.add_argument("--save", choices=["images", "landmarks", "both"], default="images",
+                    help="save cropped JPEGs, landmark vectors (gesture_landmarks/) or both")
+parser.add_argument("--writers", type=int, default=2, help="background image writer threads")
+parser.add_argument("--write-queue", type=int, default=256, help="images that may wait for a writer before drops")
+args = parser.parse_args()
+
+# Ask for the labels once up front so recording never waits on the keyboard
+labels_text = args.labels or input("Enter the gesture labels, separated by commas: ")
+labels = [label.strip() for label in labels_text.split(",") if label.strip()][:9]
+if not labels:
+    print("! No gesture labels given.")
+    exit()
 
 # mediapipe hands initialization
 mp_hands = mp.solutions.hands
@@ -10,24 +91,40 @@ mp_draw = mp.solutions.drawing_utils
 
 # Directory for saving images
 root_dir = "gesture_images"
-os.makedirs(root_dir, exist_ok=True)
+save_images = args.save in ("images", "both")
+save_landmarks = args.save in ("landmarks", "both")
+
+image_writer = None
+image_counts = {}
+if save_images:
+    image_writer = ImageWriter(args.writers, args.write_queue)
+    for label in labels:
+        gesture_dir = os.path.join(root_dir, label)
+        os.makedirs(gesture_dir, exist_ok=True)
+        # Continue numbering after earlier sessions instead of overwriting them
+        image_counts[label] = len(os.listdir(gesture_dir))
+landmark_writer = LandmarkDatasetWriter("gesture_landmarks") if save_landmarks else None
 
 # Initialize Video Capture
-cap = cv2.VideoCapture(0)
+cap = open_source(args.source, camera=camera_options(args))
 if not cap.isOpened():
     print("! Camera not initialized.")
     exit()
 
+for i, label in enumerate(labels):
+    print(f"{i + 1}: select '{label}'")
 print("s: start recording data")
 print("q: quit")
 
 recording = False
-gesture_label = None
-image_count = 0
+gesture_label = labels[0]
+sample_count = 0
 
 while True:
     ret, frame = cap.read()
     if not ret:
+        if cap.live:  # the camera is reconnecting
+            continue
         break
 
     frame = cv2.flip(frame, 1)
@@ -38,62 +135,53 @@ while True:
         for hand_landmarks in result.multi_hand_landmarks:
             # mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-            # Calculate bounding box around hand
+            # Calculate a bounding box around the hand, expanded slightly for better cropping
             h, w, _ = frame.shape
-            x_min, y_min = w, h
-            x_max, y_max = 0, 0
-            
-            for lm in hand_landmarks.landmark:
-                x, y = int(lm.x * w), int(lm.y * h)
-                x_min = min(x_min, x)
-                y_min = min(y_min, y)
-                x_max = max(x_max, x)
-                y_max = max(y_max, y)
-
-            # Expand bounding box slightly for better cropping
-            padding = 20
-            x_min = max(0, x_min - padding)
-            y_min = max(0, y_min - padding)
-            x_max = min(w, x_max + padding)
-            y_max = min(h, y_max + padding)
-
-            # Crop the hand region
-            cropped_hand = frame[y_min:y_max, x_min:x_max]
-                
-            # Save the current frame as an image
-            if recording and gesture_label:
-                # Create a directory for the gesture label if it doesn't exist
-                gesture_dir = os.path.join(root_dir, gesture_label)
-                os.makedirs(gesture_dir, exist_ok=True)
-
-                # Save the cropped hand image
-                image_path = os.path.join(gesture_dir, f"{image_count}.jpg")
-                cv2.imwrite(image_path, cropped_hand)
-                image_count += 1
-
+            points = np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark], dtype=np.float32)
+            x_min, y_min, x_max, y_max = hand_bbox(points, w, h, padding=20)
+
+            # Save the current sample
+            if recording:
+                if image_writer is not None:
+                    # Copy the crop, the overlay text is drawn on the frame below
+                    cropped_hand = frame[y_min:y_max, x_min:x_max].copy()
+                    image_path = os.path.join(root_dir, gesture_label, f"{image_counts[gesture_label]}.jpg")
+                    image_writer.save(image_path, cropped_hand)
+                    image_counts[gesture_label] += 1
+                if landmark_writer is not None:
+                    landmark_writer.append(gesture_label, points)
+                sample_count += 1
 
     # Display Instructions
-    cv2.putText(frame, "Press 's' to start/stop recording.", (10, 30),
+    cv2.putText(frame, f"Label: {gesture_label} (1-{len(labels)} to change)", (10, 30),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-    cv2.putText(frame, f"Recording: {'ON' if recording else 'OFF'}", (10, 60),
+    cv2.putText(frame, f"Recording: {'ON' if recording else 'OFF'} ('s' to toggle)  samples: {sample_count}", (10, 60),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255) if recording else (255, 0, 0), 2)
-    cv2.putText(frame, "Press 'q' to quit.", (10, 90),
+    if image_writer is not None:
+        cv2.putText(frame, f"Writer queue: {image_writer.queue.qsize()}  dropped: {image_writer.dropped}", (10, 90),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    cv2.putText(frame, "Press 'q' to quit.", (10, 120),
                 cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
 
     # Show the frame
     cv2.imshow("***capture***", frame)
 
     # Handle key presses
-    key = cv2.waitKey(10)
+    key = cv2.waitKey(1) & 0xFF
     if key == ord('q'):
         break
     elif key == ord('s'):
         recording = not recording  # Toggle recording state
-        if recording:
-            gesture_label = input("Enter the gesture label: ")  # Set label for recording
-        else:
-            gesture_label = None  # Clear label when recording stops
+    elif ord('1') <= key < ord('1') + len(labels):
+        gesture_label = labels[key - ord('1')]
 
 # Release resources
 cap.release()
 cv2.destroyAllWindows()
+if image_writer is not None:
+    image_writer.close()
+    print(f"Images written: {image_writer.written}, dropped: {image_writer.dropped}, failed: {image_writer.failed}, "
+          f"deepest writer queue: {image_writer.max_lag}")
+if landmark_writer is not None:
+    landmark_writer.close()
+    print(f"Landmark samples appended: {landmark_writer.count}")
@@ -0,0 +1,94 @@
+import time
+
+
+class Action:
+    """How a recognized gesture turns into events.
+
+    - `min_score`: recognitions scoring lower are treated as no gesture.
+    - `continuous`: fire on every frame while the gesture is held.
+    - `repeat`: otherwise the action fires once when the gesture starts and,
+      if `repeat` is set, again at most every `repeat` seconds while held.
+    - `coalesce`: count the held frames between repeats and fire them as
+      one event with that many steps instead of dropping them.
+    """
+
+    __slots__ = ("name", "min_score", "repeat", "coalesce", "continuous")
+
+    def __init__(self, name, min_score=0.5, repeat=None, coalesce=False, continuous=False):
+        self.name = name
+        self.min_score = min_score
+        self.repeat = repeat
+        self.coalesce = coalesce
+        self.continuous = continuous
+
+
+class GestureDispatcher:
+    """Turn per-frame gestures into debounced, rate-limited action events.
+
+    `table` maps gesture names to Actions. A gesture only becomes active
+    once it wins at least `votes` of the last `window` frames, so
+    single-frame misclassifications never fire. update() returns a list of
+    (action name, steps) events for the frame.
+    """
+
+    def __init__(self, table, window=5, votes=3):
+        self.table = table
+        self.window = window
+        self.votes = votes
+        self.active = None
+        self._history = [None] * window
+        self._index = 0
+        self._last_fired = 0.0
+        self._pending_steps = 0
+
+    def reset(self):
+        self._history = [None] * self.window
+        self.active = None
+        self._pending_steps = 0
+
+    def update(self, gesture, score=1.0, now=None):
+        """Feed the top gesture of a frame (None when no hand) and return the events to run."""
+        now = time.monotonic() if now is None else now
+        action = self.table.get(gesture)
+        if action is None or score < action.min_score:
+            gesture = None
+
+        # Record the frame in the ring buffer and take the N-of-M vote
+        self._history[self._index] = gesture
+        self._index = (self._index + 1) % self.window
+        counts = {}
+        for past in self._history:
+            if past is not None:
+                counts[past] = counts.get(past, 0) + 1
+        voted = max(counts, key=counts.get) if counts else None
+        if voted is not None and counts[voted] < self.votes:
+            voted = None
+
+        events = []
+        if voted != self.active:
+            # Flush steps coalesced for the gesture that just ended
+            if self.active is not None and self._pending_steps:
+                events.append((self.table[self.active].name, self._pending_steps))
+            self._pending_steps = 0
+            self.active = voted
+            if voted is not None:
+                events.append((self.table[voted].name, 1))
+                self._last_fired = now
+            return events
+
+        if voted is None:
+            return events
+
+        action = self.table[voted]
+        if action.continuous:
+            events.append((action.name, 1))
+        elif action.repeat is not None:
+            if action.coalesce and gesture == voted:
+                self._pending_steps += 1
+            steps = self._pending_steps if action.coalesce else 1
+            # A coalescing action with nothing counted waits for its next counted frame
+            if steps and now - self._last_fired >= action.repeat:
+                events.append((action.name, steps))
+                self._pending_steps = 0
+                self._last_fired = now
+        return events
@@ -0,0 +1,191 @@
+import mmap
+import os
+import threading
+
+import numpy as np
+
+
+class LineIndex:
+    """Byte offsets of the line starts in a memory-mapped text file.
+
+    The index is built on a background thread in large chunks with NumPy, so
+    the first lines can be shown while the rest of the file is still being
+    scanned. `progress` goes from 0 to 1 and `line_count` grows as it runs.
+    """
+
+    def __init__(self, path, chunk_size=16 * 1024 * 1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+        self._offsets = np.zeros(1 << 16, dtype=np.int64)
+        self._count = 1  # Offsets stored; line i spans offsets[i] to offsets[i + 1]
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = None
+        self.indexed_bytes = 0
+        self.done = threading.Event()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._build, daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def progress(self):
+        return 1.0 if not self.size else self.indexed_bytes / self.size
+
+    @property
+    def line_count(self):
+        """Number of complete lines indexed so far."""
+        return self._count - 1
+
+    def _append(self, offsets):
+        with self._lock:
+            needed = self._count + len(offsets)
+            if needed > len(self._offsets):
+                grown = np.zeros(max(needed, 2 * len(self._offsets)), dtype=np.int64)
+                grown[:self._count] = self._offsets[:self._count]
+                self._offsets = grown
+            self._offsets[self._count:needed] = offsets
+            self._count = needed
+
+    def _build(self):
+        try:
+            for start in range(0, self.size, self.chunk_size):
+                if self._closed:
+                    return
+                length = min(self.chunk_size, self.size - start)
+                chunk = np.frombuffer(self._map, dtype=np.uint8, count=length, offset=start)
+                # Every newline starts a new line right after it
+                self._append(np.flatnonzero(chunk == 10) + start + 1)
+                del chunk  # Release the view so the map can be closed
+                self.indexed_bytes = start + length
+            # The last line may have no trailing newline
+            if self._offsets[self._count - 1] != self.size:
+                self._append(np.array([self.size]))
+        finally:
+            self.done.set()
+
+    def text(self, start, stop):
+        """Decode lines [start, stop) as one string."""
+        with self._lock:
+            stop = min(stop, self._count - 1)
+            if start >= stop:
+                return ""
+            begin, end = int(self._offsets[start]), int(self._offsets[stop])
+        return self._map[begin:end].decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+    def close(self):
+        self._closed = True
+        if self._thread is not None:
+            self._thread.join()
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class DocumentView:
+    """Show a window of a LineIndex's lines in a tk.Text, loading more as it scrolls.
+
+    Only `window` lines are ever inserted. When the view comes within
+    `margin` lines of either end of the window, lines are added on that side
+    and dropped from the other. The vertical scrollbar is driven here so it
+    reflects the position in the whole file rather than in the window.
+    """
+
+    def __init__(self, text, scrollbar, index, window=600, margin=150):
+        self.text = text
+        self.scrollbar = scrollbar
+        self.index = index
+        self.window = window
+        self.margin = margin
+        self.first = 0  # File line shown on the first line of the widget
+        self.loaded = 0  # Lines currently inserted
+
+        self.text.config(yscrollcommand=self._on_text_scroll)
+        self.scrollbar.config(command=self.yview)
+        self.text.delete("1.0", "end")
+
+    def _top_line(self):
+        """File line number at the top of the viewport."""
+        return self.first + int(self.text.index("@0,0").split(".")[0]) - 1
+
+    def _bottom_line(self):
+        return self.first + int(self.text.index(f"@0,{self.text.winfo_height()}").split(".")[0]) - 1
+
+    def load(self, line):
+        """Replace the window with the lines around `line` and scroll to it."""
+        total = self.index.line_count
+        line = max(0, min(line, total - 1))
+        self.first = max(0, min(line - self.window // 2, total - self.window))
+        self.loaded = min(self.window, total - self.first)
+        self.text.delete("1.0", "end")
+        self.text.insert("1.0", self.index.text(self.first, self.first + self.loaded))
+        self.text.yview(f"{line - self.first + 1}.0")
+
+    def refresh(self):
+        """Fill the window with newly indexed lines and slide it toward the viewport."""
+        if self.loaded == 0:
+            if self.index.line_count:
+                self.load(0)
+            return
+
+        top = self._top_line()
+        last = self.first + self.loaded
+        total = self.index.line_count
+
+        if last - self._bottom_line() < self.margin and last < total:
+            # Extend below and drop lines that scrolled far above the view
+            added = min(self.window // 2, total - last)
+            self.text.insert("end-1c", self.index.text(last, last + added))
+            self.loaded += added
+            extra = max(0, self.loaded - self.window)
+            if extra:
+                self.text.delete("1.0", f"{extra + 1}.0")
+                self.first += extra
+                self.loaded -= extra
+            self.text.yview(f"{top - self.first + 1}.0")
+        elif top - self.first < self.margin and self.first > 0:
+            # Extend above and drop lines far below the view
+            added = min(self.window // 2, self.first)
+            self.text.insert("1.0", self.index.text(self.first - added, self.first))
+            self.first -= added
+            self.loaded += added
+            extra = max(0, self.loaded - self.window)
+            if extra:
+                self.text.delete(f"{self.loaded - extra + 1}.0", "end-1c")
+                self.loaded -= extra
+            self.text.yview(f"{top - self.first + 1}.0")
+
+    def yview_scroll(self, number, what):
+        """Scroll like Text.yview_scroll, loading lines as needed."""
+        self.text.yview_scroll(number, what)
+        self.refresh()
+
+    def yview(self, *args):
+        """Scrollbar command: positions are fractions of the whole file."""
+        total = self.index.line_count
+        if args[0] == "moveto":
+            target = int(float(args[1]) * total)
+            if self.first <= target < self.first + self.loaded - self.margin:
+                self.text.yview(f"{target - self.first + 1}.0")
+            else:
+                self.load(target)
+        elif args[0] == "scroll":
+            self.text.yview_scroll(int(args[1]), args[2])
+        self.refresh()
+
+    def _on_text_scroll(self, low, high):
+        total = max(self.index.line_count, 1)
+        low = (self.first + float(low) * self.loaded) / total
+        high = (self.first + float(high) * self.loaded) / total
+        self.scrollbar.set(low, min(high, 1.0))
+
+    def close(self):
+        """Hand the widget and scrollbar back to normal whole-text scrolling."""
+        self.text.config(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.config(command=self.text.yview)
+        self.index.close()
@@ -0,0 +1,172 @@
+"""Evaluate .task gesture models on a gesture_images/<label>/ tree.
+
+    python evaluate_model.py custom_gestures.task gesture_recognizer.task --images gesture_images
+
+Images are recognized on a process pool with one recognizer per worker.
+Results are cached by model hash and image hash, so evaluating again after
+adding images or retraining only runs the new combinations. Folder names are
+matched to the model's category names case-insensitively; images with no
+recognized gesture count as "none".
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from benchmark import percentiles
+from preprocess_dataset import file_hash, find_images
+
+NO_GESTURE = "none"
+
+# Each worker process keeps its own recognizer here
+_recognizer = None
+
+
+def _init_worker(model_path):
+    global _recognizer
+    from recognition import create_recognizer, warm_up
+    _recognizer = create_recognizer(model_path)
+    warm_up(_recognizer)  # Keep the cold start out of the per-image latency
+
+
+def recognize_image(path):
+    """Return (gesture, score, recognize seconds) for an image file."""
+    import cv2
+    from recognition import recognize_rgb
+
+    frame = cv2.imread(path)
+    if frame is None:
+        return NO_GESTURE, 0.0, 0.0
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    start = time.perf_counter()
+    result = recognize_rgb(_recognizer, rgb_frame)
+    seconds = time.perf_counter() - start
+    if result.gestures and result.gestures[0]:
+        top = result.gestures[0][0]
+        return top.category_name or NO_GESTURE, top.score, seconds
+    return NO_GESTURE, 0.0, seconds
+
+
+def load_cache(path):
+    """Read cached {image hash: [gesture, score, seconds]} results for one model."""
+    results = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # A line cut short by an interrupted run
+                results[entry["image"]] = entry["result"]
+    return results
+
+
+def confusion_matrix(true_labels, predicted, classes):
+    index = {name: i for i, name in enumerate(classes)}
+    matrix = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    for actual, guess in zip(true_labels, predicted):
+        matrix[index[actual], index[guess]] += 1
+    return matrix
+
+
+def evaluate(model_path, images, digests, args):
+    """Evaluate one model and return its report."""
+    model_hash = file_hash(model_path)
+    cache_path = os.path.join(args.cache, f"{model_hash}.jsonl")
+    cached = {} if args.no_cache else load_cache(cache_path)
+
+    pending = {}
+    for (path, _), digest in zip(images, digests):
+        if digest not in cached and digest not in pending:
+            pending[digest] = path
+
+    start = time.perf_counter()
+    latencies = []
+    if pending:
+        os.makedirs(args.cache, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(model_path,)) as executor, \
+                open(cache_path, "a", encoding="utf-8") as cache_file:
+            for digest, result in zip(pending, executor.map(recognize_image, pending.values(), chunksize=8)):
+                cached[digest] = list(result)
+                latencies.append(result[2])
+                cache_file.write(json.dumps({"image": digest, "result": list(result)}) + "\n")
+    seconds = time.perf_counter() - start
+
+    true_labels = [label.lower() for _, label in images]
+    predicted = [cached[digest][0].lower() for digest in digests]
+    classes = sorted(set(true_labels) | set(predicted))
+    matrix = confusion_matrix(true_labels, predicted, classes)
+    totals = matrix.sum(axis=1)
+    return {
+        "model": model_path,
+        "model_hash": model_hash,
+        "images": len(images),
+        "evaluated": len(pending),
+        "cached": len(images) - len(pending),
+        "accuracy": round(float(np.trace(matrix) / max(len(images), 1)), 4),
+        "per_class_accuracy": {name: round(float(matrix[i, i] / totals[i]), 4)
+                               for i, name in enumerate(classes) if totals[i]},
+        "classes": classes,
+        "confusion_matrix": matrix.tolist(),
+        "latency": percentiles(latencies),  # Images recognized in this run only; cached results are not re-timed
+        "timed_images": len(latencies),
+        "images_per_second": round(len(pending) / seconds, 2) if pending else None,
+    }
+
+
+def print_report(report):
+    print(f"{report['model']}: accuracy {report['accuracy']:.3f} on {report['images']} images "
+          f"({report['evaluated']} evaluated, {report['cached']} cached)")
+    if report["timed_images"]:
+        latency = report["latency"]
+        print(f"  {report['images_per_second']} images/s, recognize p50 {latency['p50']:.1f} ms "
+              f"p95 {latency['p95']:.1f} ms p99 {latency['p99']:.1f} ms"
+              + (f" (over the {report['timed_images']} images evaluated now; cached results are not timed)"
+                 if report["cached"] else ""))
+    else:
+        print("  latency: not measured, every result came from the cache (use --no-cache to re-time)")
+
+    classes = report["classes"]
+    header = "actual \\ predicted"
+    label_width = max(len(header), *(len(name) for name in classes)) + 2
+    width = max(6, *(len(name) for name in classes)) + 2
+    print("  " + header.ljust(label_width) + "".join(name.rjust(width) for name in classes))
+    for name, row in zip(classes, report["confusion_matrix"]):
+        print("  " + name.ljust(label_width) + "".join(str(count).rjust(width) for count in row))
+    print("  per-class accuracy: " + ", ".join(f"{name} {accuracy:.3f}"
+                                              for name, accuracy in report["per_class_accuracy"].items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate .task gesture models on a labelled image tree")
+    parser.add_argument("models", nargs="+", help=".task bundles to evaluate")
+    parser.add_argument("--images", default="gesture_images", help="directory with one folder per label")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="recognizer processes")
+    parser.add_argument("--cache", help="result cache directory (default: <images>/.eval_cache)")
+    parser.add_argument("--no-cache", action="store_true", help="recognize every image again, e.g. to re-time")
+    parser.add_argument("--json", help="write the reports to this file")
+    args = parser.parse_args()
+    args.cache = args.cache or os.path.join(args.images, ".eval_cache")
+
+    images = find_images(args.images)
+    if not images:
+        raise SystemExit(f"Error: no images found under {args.images}")
+    digests = [file_hash(path) for path, _ in images]
+
+    reports = []
+    for model_path in args.models:
+        report = evaluate(model_path, images, digests, args)
+        print_report(report)
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import cv2
+import numpy as np
+
+# JPEG start-of-frame markers that carry the image size (baseline, progressive, ...)
+_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# Reduced-size decode flags by scale; libjpeg scales the DCT, so these skip most of the work
+_REDUCED_COLOR = [(8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2)]
+
+RAW_CHANNELS = {"rgb": 3, "gray": 1}
+
+
+def raw_frame_size(width, height, pixel_format):
+    """Number of bytes in a raw frame; raises ValueError for an unknown format or bad dimensions."""
+    channels = RAW_CHANNELS.get(pixel_format)
+    if channels is None:
+        raise ValueError(f"unknown pixel format {pixel_format!r}; use one of {sorted(RAW_CHANNELS)}")
+    if width <= 0 or height <= 0:
+        raise ValueError("width and height must be positive")
+    return width * height * channels
+
+
+def jpeg_size(data):
+    """Return (width, height) from a JPEG header, or None if data is not a JPEG."""
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # Fill byte
+            i += 1
+            continue
+        length = int.from_bytes(data[i + 2:i + 4], "big")
+        if marker in _SOF_MARKERS:
+            height = int.from_bytes(data[i + 5:i + 7], "big")
+            width = int.from_bytes(data[i + 7:i + 9], "big")
+            return width, height
+        i += 2 + length
+    return None
+
+
+def reduced_decode_flag(width, height, min_side):
+    """Largest JPEG reduction that keeps the longer side at least min_side pixels."""
+    longest = max(width, height)
+    for scale, flag in _REDUCED_COLOR:
+        if longest // scale >= min_side:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+class FrameDecoder:
+    """Turn uploaded payloads into RGB frames for the recognizer.
+
+    JPEGs bigger than needed are decoded at 1/2, 1/4 or 1/8 size, and the
+    BGR to RGB swap happens in place in the decoded array. Raw grayscale
+    payloads are expanded into a buffer reused while the frame size stays
+    the same, so keep one decoder per worker thread.
+    """
+
+    def __init__(self):
+        self._rgb_buffer = None
+
+    def _buffer(self, shape):
+        # Only the latest size is kept, so clients declaring many sizes can't grow memory
+        if self._rgb_buffer is None or self._rgb_buffer.shape != shape:
+            self._rgb_buffer = np.empty(shape, dtype=np.uint8)
+        return self._rgb_buffer
+
+    def decode(self, contents, min_side=None):
+        """Decode an encoded image to RGB, at reduced size when its longer side exceeds min_side.
+
+        Returns None if the image cannot be decoded.
+        """
+        flag = cv2.IMREAD_COLOR
+        if min_side:
+            size = jpeg_size(contents)
+            if size is not None:
+                flag = reduced_decode_flag(size[0], size[1], min_side)
+        frame = cv2.imdecode(np.frombuffer(contents, np.uint8), flag)
+        if frame is None:
+            return None
+        # The decoded array is ours, so swap the channels without allocating another frame
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=frame)
+
+    def from_raw(self, contents, width, height, pixel_format="rgb"):
+        """Wrap raw 8-bit RGB or grayscale pixels of the declared size as an RGB frame."""
+        expected = raw_frame_size(width, height, pixel_format)
+        if len(contents) != expected:
+            raise ValueError(f"expected {expected} bytes for {width}x{height} {pixel_format}, got {len(contents)}")
+        pixels = np.frombuffer(contents, np.uint8)
+        if pixel_format == "rgb":
+            return pixels.reshape(height, width, 3)  # Already RGB; no copy
+        return cv2.cvtColor(pixels.reshape(height, width), cv2.COLOR_GRAY2RGB, dst=self._buffer((height, width, 3)))
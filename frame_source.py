@@ -0,0 +1,99 @@
+import os
+
+import cv2
+
+from camera import Camera
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class VideoSource:
+    """Frames from a webcam index or a video file via cv2.VideoCapture."""
+
+    def __init__(self, target):
+        self.capture = cv2.VideoCapture(target)
+        self.live = isinstance(target, int)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self):
+        return self.capture.read()
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageDirectorySource:
+    """Frames from the image files of a directory, in sorted filename order."""
+
+    live = False
+
+    def __init__(self, path, fps=30.0):
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.fps = fps
+        self._index = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self):
+        while self._index < len(self.paths):
+            frame = cv2.imread(self.paths[self._index])
+            self._index += 1
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def release(self):
+        self._index = len(self.paths)
+
+
+class ArraySource:
+    """Frames from an in-memory array of shape (n, h, w, 3) or any iterable of BGR frames."""
+
+    live = False
+
+    def __init__(self, frames, fps=30.0):
+        self._frames = iter(frames)
+        self.fps = fps
+
+    def isOpened(self):
+        return self._frames is not None
+
+    def read(self):
+        if self._frames is None:
+            return False, None
+        try:
+            return True, next(self._frames)
+        except StopIteration:
+            self._frames = None
+            return False, None
+
+    def release(self):
+        self._frames = None
+
+
+def open_source(source, fps=None, camera=None):
+    """Open a webcam index, video file, image directory or in-memory frame stream.
+
+    Every source has the cv2.VideoCapture interface used by the scripts
+    (`isOpened`, `read`, `release`) plus `fps` and `live` attributes.
+    Webcams open as a Camera, configured with the `camera` keyword arguments.
+    """
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        frame_source = Camera(int(source), **(camera or {}))
+    elif isinstance(source, str) and os.path.isdir(source):
+        frame_source = ImageDirectorySource(source)
+    elif isinstance(source, str):
+        frame_source = VideoSource(source)
+    else:
+        frame_source = ArraySource(source)
+
+    if fps:
+        frame_source.fps = fps
+    return frame_source
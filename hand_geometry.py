@@ -0,0 +1,77 @@
+"""Vectorized hand geometry over (hands, 21, 3) landmark arrays.
+
+Distances are divided by the palm size (wrist to middle-finger knuckle), so
+thresholds hold whether the hand is close to the camera or far from it.
+"""
+import numpy as np
+
+NUM_LANDMARKS = 21
+
+# Landmark indices
+WRIST = 0
+THUMB_MCP, THUMB_TIP = 2, 4
+INDEX_MCP = 5
+MIDDLE_MCP = 9
+FINGER_MCPS = [5, 9, 13, 17]  # Index, middle, ring, pinky knuckles
+FINGER_PIPS = [6, 10, 14, 18]  # Index, middle, ring, pinky middle joints
+FINGER_TIPS = [8, 12, 16, 20]
+TIPS = [THUMB_TIP] + FINGER_TIPS
+
+# Minimum wrist-to-tip distances, in palm sizes, for thumb..pinky on an open palm
+OPEN_PALM_TIPS = np.array([1.0, 1.5, 1.5, 1.4, 1.2], dtype=np.float32)
+# Maximum thumb-to-index-tip distance, in palm sizes, for a pinch
+PINCH_DISTANCE = 0.3
+
+
+def stack_hands(hand_landmarks):
+    """Convert detected hands into one (hands, 21, 3) float32 array.
+
+    Accepts mediapipe solution results (objects with `.landmark`) as well as
+    plain lists of landmarks, as found in GestureRecognizerResult.hand_landmarks.
+    """
+    hands = [getattr(hand, "landmark", hand) for hand in hand_landmarks or []]
+    array = np.array([[(lm.x, lm.y, lm.z) for lm in hand] for hand in hands], dtype=np.float32)
+    return array.reshape(-1, NUM_LANDMARKS, 3)
+
+
+def palm_centroid(hands, indices=(WRIST, INDEX_MCP)):
+    """Mean (x, y) of the given landmarks for every hand; returns (hands, 2)."""
+    return np.asarray(hands)[:, list(indices), :2].mean(axis=1)
+
+
+class HandGeometry:
+    """Distances and joint angles for all hands of a frame, computed in one pass.
+
+    `width` and `height` scale normalized x and y back to the frame's aspect
+    ratio, so distances are not skewed on non-square frames.
+    """
+
+    def __init__(self, hands, width=1.0, height=1.0):
+        self.hands = np.asarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+        points = self.hands[:, :, :2] * np.array([width, height], dtype=np.float32)
+        wrist = points[:, WRIST:WRIST + 1]
+
+        self.palm = np.linalg.norm(points[:, MIDDLE_MCP] - points[:, WRIST], axis=1) + 1e-6
+        # Wrist to thumb..pinky tips, (hands, 5)
+        self.tips = np.linalg.norm(points[:, TIPS] - wrist, axis=2) / self.palm[:, None]
+        # Thumb tip to index tip, (hands,)
+        self.pinch = np.linalg.norm(points[:, THUMB_TIP] - points[:, FINGER_TIPS[0]], axis=1) / self.palm
+
+        # Bend at each finger's middle joint in degrees (0 is straight), (hands, 4)
+        lower = points[:, FINGER_PIPS] - points[:, FINGER_MCPS]
+        upper = points[:, FINGER_TIPS] - points[:, FINGER_PIPS]
+        cosine = (lower * upper).sum(axis=2) / (
+            np.linalg.norm(lower, axis=2) * np.linalg.norm(upper, axis=2) + 1e-6)
+        self.bend = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+    def __len__(self):
+        return len(self.hands)
+
+    def open_palm(self, thresholds=OPEN_PALM_TIPS):
+        """True for hands with every fingertip far from the wrist."""
+        return (self.tips >= thresholds).all(axis=1)
+
+    def pinched(self, threshold=PINCH_DISTANCE):
+        """True for hands whose thumb and index tips touch, with the index tip above the thumb."""
+        index_above = self.hands[:, FINGER_TIPS[0], 1] <= self.hands[:, THUMB_TIP, 1]
+        return (self.pinch < threshold) & index_above
@@ -0,0 +1,88 @@
+import time
+
+import cv2
+import numpy as np
+
+from metrics import metrics
+
+
+class MotionDetector:
+    """Cheap motion check on a tiny grayscale thumbnail of each frame."""
+
+    def __init__(self, threshold=6.0, size=(32, 24)):
+        self.threshold = threshold
+        self.size = size
+        self._previous = None
+
+    def reset(self):
+        self._previous = None
+
+    def __call__(self, frame):
+        """Return True when the mean pixel change since the last frame exceeds the threshold."""
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY).astype(np.int16)
+        previous, self._previous = self._previous, gray
+        if previous is None:
+            return False
+        return float(np.abs(gray - previous).mean()) > self.threshold
+
+
+class IdleController:
+    """Lower the recognition rate while nobody is interacting.
+
+    After `idle_after` consecutive frames with no hand or only idle gestures,
+    frames are recognized at most once every `idle_interval` seconds. Motion
+    detected on a downsampled frame difference, or a non-idle gesture on a
+    sampled frame, switches back to full rate. Time spent in each mode and
+    the number of wake-ups are exported as metrics counters.
+    """
+
+    def __init__(self, idle_after=90, idle_interval=1.0, motion_threshold=6.0, idle_gestures=("idle", "None")):
+        self.idle_after = idle_after
+        self.idle_interval = idle_interval
+        # A hand without a gesture category comes through as None; that is no more activity than "None"
+        self.idle_gestures = set(idle_gestures) | {None}
+        self.motion = MotionDetector(motion_threshold)
+
+        self.active = True
+        self.quiet_frames = 0
+        self.wakeups = 0
+        self._last_sample = 0.0
+        self._last_tick = None
+
+    def should_recognize(self, rgb_frame):
+        """Decide whether this frame goes to the recognizer."""
+        now = time.monotonic()
+        if self._last_tick is not None:
+            metrics.inc("mode_seconds", now - self._last_tick, mode="active" if self.active else "idle")
+        self._last_tick = now
+
+        if self.active:
+            return True
+        if self.motion(rgb_frame):
+            self._wake("motion")
+            return True
+        if now - self._last_sample >= self.idle_interval:
+            self._last_sample = now
+            return True
+        metrics.inc("frames_skipped_idle")
+        return False
+
+    def observe(self, gestures):
+        """Record the gestures recognized in a frame (empty when no hand was found)."""
+        if all(gesture in self.idle_gestures for gesture in gestures):
+            self.quiet_frames += 1
+            if self.active and self.quiet_frames >= self.idle_after:
+                self.active = False
+                self.motion.reset()
+                self._last_sample = time.monotonic()
+        else:
+            self.quiet_frames = 0
+            if not self.active:
+                self._wake("gesture")
+
+    def _wake(self, reason):
+        self.active = True
+        self.quiet_frames = 0
+        self.wakeups += 1
+        metrics.inc("wakeups", reason=reason)
@@ -0,0 +1,147 @@
+"""Fast landmark gesture classifier trained from labelled landmark rows.
+
+Training data uses the x0,y0,...,x20,y20,label CSV format of
+scrapped/gesture_data.csv, or a landmark dataset directory recorded by
+data_collect.py --save landmarks:
+
+    python landmark_classifier.py train scrapped/gesture_data.csv -o gesture_knn.npz
+    python landmark_classifier.py eval scrapped/gesture_data.csv --holdout 0.2
+
+The model is a k-nearest-neighbour index over wrist-relative,
+scale-normalized landmarks, scored with one matrix product per batch.
+"""
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+
+from landmark_dataset import load_dataset
+
+NUM_LANDMARKS = 21
+
+
+def normalize(hands):
+    """Make (n, 21, 2+) landmarks translation- and scale-invariant.
+
+    Points are taken relative to the wrist and divided by the distance to the
+    farthest point, then flattened to (n, 42) feature vectors.
+    """
+    points = np.asarray(hands, dtype=np.float32)[..., :2]
+    points = points - points[:, :1]
+    scale = np.linalg.norm(points, axis=2).max(axis=1)
+    points = points / (scale[:, None, None] + 1e-6)
+    return points.reshape(len(points), -1)
+
+
+def load_csv(path):
+    """Read landmark rows and return ((n, 21, 2) array, list of labels)."""
+    hands, labels = [], []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            hands.append([(float(row[f"x{i}"]), float(row[f"y{i}"])) for i in range(NUM_LANDMARKS)])
+            labels.append(row["label"])
+    return np.asarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 2), labels
+
+
+def load_samples(path):
+    """Read labelled landmarks from a CSV file or a landmark dataset directory."""
+    if os.path.isdir(path):
+        return load_dataset(path)
+    return load_csv(path)
+
+
+class LandmarkClassifier:
+    """k-nearest-neighbour classifier over normalized hand landmarks."""
+
+    def __init__(self, vectors, labels, classes, k=5):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.sq_norms = (self.vectors ** 2).sum(axis=1)
+        self.labels = np.asarray(labels, dtype=np.int32)
+        self.classes = list(classes)
+        self.k = min(k, len(self.vectors))
+
+    @classmethod
+    def fit(cls, hands, labels, k=5):
+        """Build the index from (n, 21, 2+) landmarks and their label names."""
+        classes = sorted(set(labels))
+        index = {name: i for i, name in enumerate(classes)}
+        return cls(normalize(hands), [index[label] for label in labels], classes, k)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls(data["vectors"], data["labels"], data["classes"].tolist(), int(data["k"]))
+
+    def save(self, path):
+        np.savez_compressed(path, vectors=self.vectors, labels=self.labels,
+                            classes=np.asarray(self.classes), k=self.k)
+
+    def predict_batch(self, hands):
+        """Classify (n, 21, 2+) landmarks in one call; returns (label names, scores)."""
+        if not len(hands):
+            return [], np.zeros(0, dtype=np.float32)
+        queries = normalize(hands)
+
+        # Squared distances up to a per-query constant, which does not change the ranking
+        distances = self.sq_norms[None, :] - 2 * queries @ self.vectors.T
+        nearest = np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+
+        votes = np.zeros((len(queries), len(self.classes)), dtype=np.float32)
+        np.add.at(votes, (np.arange(len(queries))[:, None], self.labels[nearest]), 1)
+        best = votes.argmax(axis=1)
+        scores = votes[np.arange(len(queries)), best] / self.k
+        return [self.classes[i] for i in best], scores
+
+    def predict(self, hand):
+        """Classify a single (21, 2+) hand; returns (label name, score)."""
+        labels, scores = self.predict_batch(np.asarray(hand)[None])
+        return labels[0], float(scores[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or evaluate the landmark gesture classifier")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train", help="build a model from a landmark CSV or dataset directory")
+    train.add_argument("data")
+    train.add_argument("-o", "--output", default="gesture_knn.npz")
+    train.add_argument("-k", type=int, default=5)
+
+    evaluate = subparsers.add_parser("eval", help="measure accuracy and latency on a held-out split")
+    evaluate.add_argument("data")
+    evaluate.add_argument("--holdout", type=float, default=0.2)
+    evaluate.add_argument("-k", type=int, default=5)
+    evaluate.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    hands, labels = load_samples(args.data)
+
+    if args.command == "train":
+        model = LandmarkClassifier.fit(hands, labels, args.k)
+        model.save(args.output)
+        print(f"Saved {len(labels)} samples of {len(model.classes)} classes to {args.output}")
+        return
+
+    order = np.random.default_rng(args.seed).permutation(len(labels))
+    split = int(len(order) * (1 - args.holdout))
+    train_idx, test_idx = order[:split], order[split:]
+    model = LandmarkClassifier.fit(hands[train_idx], [labels[i] for i in train_idx], args.k)
+
+    start = time.perf_counter()
+    predicted, _ = model.predict_batch(hands[test_idx])
+    batch_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in test_idx[:200]:
+        model.predict(hands[i])
+    single_seconds = (time.perf_counter() - start) / min(len(test_idx), 200)
+
+    accuracy = np.mean([p == labels[i] for p, i in zip(predicted, test_idx)])
+    print(f"Accuracy: {accuracy:.3f} on {len(test_idx)} held-out hands")
+    print(f"Batch: {batch_seconds / len(test_idx) * 1e6:.1f} us/hand, single: {single_seconds * 1e6:.1f} us/hand")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compact on-disk landmark dataset.
+
+A dataset is a directory holding `landmarks.f32`, the raw float32 (21, 3)
+landmarks of every sample back to back, and `labels.txt` with one label per
+line in the same order. Both files are append-only, so recording sessions can
+add to an existing dataset, and loading is a single np.fromfile call.
+"""
+import os
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+LANDMARKS_FILE = "landmarks.f32"
+LABELS_FILE = "labels.txt"
+
+
+class LandmarkDatasetWriter:
+    """Append (label, landmarks) samples to a dataset directory."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.count = 0
+        self._landmarks = open(os.path.join(directory, LANDMARKS_FILE), "ab")
+        self._labels = open(os.path.join(directory, LABELS_FILE), "a", encoding="utf-8")
+
+    def append(self, label, points):
+        """Add one hand; points are (21, 2 or 3) normalized landmarks."""
+        row = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        points = np.asarray(points, dtype=np.float32)
+        row[:, :points.shape[1]] = points[:, :3]
+        self._landmarks.write(row.tobytes())
+        self._labels.write(label + "\n")
+        self.count += 1
+
+    def close(self):
+        self._landmarks.close()
+        self._labels.close()
+
+
+def save_dataset(directory, hands, labels):
+    """Write a whole dataset, replacing any existing one in the directory."""
+    os.makedirs(directory, exist_ok=True)
+    np.ascontiguousarray(hands, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3).tofile(
+        os.path.join(directory, LANDMARKS_FILE))
+    with open(os.path.join(directory, LABELS_FILE), "w", encoding="utf-8") as f:
+        f.writelines(label + "\n" for label in labels)
+
+
+def load_dataset(directory):
+    """Read a dataset and return ((n, 21, 3) float32 array, list of labels)."""
+    hands = np.fromfile(os.path.join(directory, LANDMARKS_FILE), dtype=np.float32)
+    with open(os.path.join(directory, LABELS_FILE), encoding="utf-8") as f:
+        labels = f.read().splitlines()
+    hands = hands[:len(hands) // (NUM_LANDMARKS * 3) * NUM_LANDMARKS * 3].reshape(-1, NUM_LANDMARKS, 3)
+    # A session that was killed mid-write can leave one file a sample ahead
+    count = min(len(hands), len(labels))
+    return hands[:count], labels[:count]
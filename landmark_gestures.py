@@ -0,0 +1,71 @@
+import numpy as np
+
+from hand_geometry import FINGER_PIPS, FINGER_TIPS, INDEX_MCP, NUM_LANDMARKS, THUMB_MCP, THUMB_TIP, WRIST
+
+
+def parse_landmarks_json(payload):
+    """Read {"hands": [...]} where each hand is 21 [x, y, z] points or 63 flat floats."""
+    hands = payload.get("hands") if isinstance(payload, dict) else payload
+    try:
+        array = np.asarray(hands, dtype=np.float32)
+    except (TypeError, ValueError):
+        raise ValueError("hands must be a list of numeric landmark arrays")
+    return _as_hands(array)
+
+
+def parse_landmarks_binary(data):
+    """Read packed little-endian float32 landmarks, 21 x 3 values per hand."""
+    if len(data) % (NUM_LANDMARKS * 3 * 4):
+        raise ValueError(f"payload size must be a multiple of {NUM_LANDMARKS * 3 * 4} bytes")
+    return _as_hands(np.frombuffer(data, dtype="<f4"))
+
+
+def _as_hands(array):
+    if array.size % (NUM_LANDMARKS * 3):
+        raise ValueError(f"each hand needs {NUM_LANDMARKS} points with x, y and z")
+    array = array.reshape(-1, NUM_LANDMARKS, 3)
+    if not np.isfinite(array).all():
+        raise ValueError("landmarks must be finite numbers")
+    return array
+
+
+def classify_landmarks(hands):
+    """Classify (n, 21, 3) normalized landmarks into the canned gesture names.
+
+    Uses finger-extension rules computed for all hands at once, and returns
+    one (gesture_name, score) per hand, with "None" when no rule matches.
+    """
+    hands = np.asarray(hands, dtype=np.float32)
+    if not len(hands):
+        return []
+    points = hands[:, :, :2]
+    wrist = points[:, WRIST:WRIST + 1]
+
+    # A finger is extended when its tip is clearly farther from the wrist than its middle joint
+    tip_dist = np.linalg.norm(points[:, FINGER_TIPS] - wrist, axis=2)
+    pip_dist = np.linalg.norm(points[:, FINGER_PIPS] - wrist, axis=2)
+    extended = tip_dist > pip_dist * 1.1
+    index, middle, ring, pinky = extended.T
+
+    # The thumb is extended when its tip is far from the index knuckle relative to palm size
+    palm_size = np.linalg.norm(points[:, INDEX_MCP] - points[:, WRIST], axis=1) + 1e-6
+    thumb_spread = np.linalg.norm(points[:, THUMB_TIP] - points[:, INDEX_MCP], axis=1) / palm_size
+    thumb_extended = thumb_spread > 0.5
+    thumb_rise = (points[:, THUMB_MCP, 1] - points[:, THUMB_TIP, 1]) / palm_size  # Image y grows downwards
+    index_up = (points[:, WRIST, 1] - points[:, FINGER_TIPS[0], 1]) / palm_size
+
+    fingers_folded = ~extended.any(axis=1)
+    rules = [
+        ("Open_Palm", extended.all(axis=1)),
+        ("Victory", index & middle & ~ring & ~pinky),
+        ("Pointing_Up", index & ~middle & ~ring & ~pinky & (index_up > 1.0)),
+        ("Thumb_Up", fingers_folded & thumb_extended & (thumb_rise > 0.5)),
+        ("Thumb_Down", fingers_folded & thumb_extended & (thumb_rise < -0.5)),
+        ("Closed_Fist", fingers_folded & ~thumb_extended),
+    ]
+
+    gestures = []
+    for i in range(len(hands)):
+        name = next((name for name, matched in rules if matched[i]), "None")
+        gestures.append((name, 1.0 if name != "None" else 0.0))
+    return gestures
@@ -0,0 +1,295 @@
+"""Load-test the frame service with simulated kiosks and report its capacity.
+
+Each simulated client opens a session and replays a frame set at a target
+FPS. Concurrency is stepped through the --clients levels to give a
+saturation curve:
+
+    python loadgen.py --clients 1,2,4,8,16 --duration 10
+    python loadgen.py --url http://localhost:8000 --endpoint ws --fps 10
+    python loadgen.py --frames clips/palm/ --json capacity.json
+
+Without --url the tool starts main.py itself on a free local port. Frames
+come from --frames (video or image directory) or are synthesized, so it runs
+offline. Server CPU is read from process_cpu_seconds_total on /metrics.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
+
+from benchmark import percentiles
+from frame_source import open_source
+
+BOUNDARY = "loadgen-frame-boundary"
+OUTCOMES = ("ok", "busy", "loading", "error")
+
+
+def synthetic_frames(count=30, size=(640, 480)):
+    """JPEG frames of a skin-coloured blob moving over a gradient."""
+    width, height = size
+    background = np.zeros((height, width, 3), dtype=np.uint8)
+    background[:] = np.linspace(40, 200, width, dtype=np.uint8)[None, :, None]
+    frames = []
+    for i in range(count):
+        frame = background.copy()
+        center = (int(width * (0.3 + 0.4 * i / count)), height // 2)
+        cv2.ellipse(frame, center, (70, 100), 0, 0, 360, (120, 160, 220), -1)
+        frames.append(cv2.imencode(".jpg", frame)[1].tobytes())
+    return frames
+
+
+def load_frames(path, limit=60):
+    """JPEG-encode up to `limit` frames from a video file or image directory."""
+    source = open_source(path)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = source.read()
+        if not ok:
+            break
+        frames.append(cv2.imencode(".jpg", frame)[1].tobytes())
+    source.release()
+    if not frames:
+        raise SystemExit(f"Error: no frames read from {path}")
+    return frames
+
+
+def landmark_payloads(count=30):
+    """Packed float32 payloads of one jittered hand each, for /process_landmarks/."""
+    rng = np.random.default_rng(0)
+    hand = rng.uniform(0.3, 0.7, (21, 3)).astype(np.float32)
+    return [(hand + rng.normal(0, 0.01, hand.shape)).astype("<f4").tobytes() for _ in range(count)]
+
+
+def multipart(frame):
+    body = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"frame.jpg\"\r\n"
+            f"Content-Type: image/jpeg\r\n\r\n").encode() + frame + f"\r\n--{BOUNDARY}--\r\n".encode()
+    return body
+
+
+def outcome(status_code, body):
+    """Classify a response as ok, busy, loading or error."""
+    try:
+        status = json.loads(body).get("status")
+    except ValueError:
+        status = None
+    if status_code == 200 and status == "success":
+        return "ok"
+    if status in ("busy", "loading"):
+        return status
+    return "error"
+
+
+class Client(threading.Thread):
+    """One simulated kiosk sending frames at a fixed rate until `stop_at`."""
+
+    def __init__(self, base_url, endpoint, payloads, fps, stop_at, offset=0):
+        super().__init__(daemon=True)
+        self.url = urlsplit(base_url)
+        self.endpoint = endpoint
+        self.payloads = payloads
+        self.interval = 1.0 / fps
+        self.stop_at = stop_at
+        self.offset = offset  # Start at a different frame than the other clients
+        self.latencies = []
+        self.counts = dict.fromkeys(OUTCOMES + ("missed",), 0)
+
+    def request(self, connection, method, path, body=b"", headers=None):
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.read()
+
+    def run(self):
+        connection = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=30)
+        try:
+            _, body = self.request(connection, "POST", "/session", b"{}", {"Content-Type": "application/json"})
+            token = json.loads(body)["session"]
+
+            if self.endpoint == "ws":
+                from websockets.sync.client import connect
+                with connect(f"ws://{self.url.netloc}/ws?session={token}") as stream:
+                    def send(payload):
+                        stream.send(payload)
+                        return 200, stream.recv()
+                    self.paced(send)
+            else:
+                if self.endpoint == "http":
+                    path, content_type = "/process_frame/", f"multipart/form-data; boundary={BOUNDARY}"
+                else:
+                    path, content_type = "/process_landmarks/", "application/octet-stream"
+                headers = {"Content-Type": content_type, "X-Session-Token": token}
+                self.paced(lambda payload: self.request(connection, "POST", path, payload, headers))
+        except Exception:
+            # A client that cannot connect or open a session counts as one error
+            self.counts["error"] += 1
+        finally:
+            connection.close()
+
+    def paced(self, send):
+        next_send = time.perf_counter()
+        i = self.offset
+        while True:
+            now = time.perf_counter()
+            if now >= self.stop_at:
+                break
+            if now < next_send:
+                time.sleep(min(next_send - now, self.stop_at - now))
+                continue
+            # Frames whose slot passed while waiting on the server are skipped, like a camera would
+            behind = int((now - next_send) / self.interval)
+            self.counts["missed"] += behind
+            next_send += (behind + 1) * self.interval
+
+            payload = self.payloads[i % len(self.payloads)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                status_code, body = send(payload)
+                result = outcome(status_code, body)
+            except Exception:
+                result = "error"
+            if result == "ok":
+                self.latencies.append(time.perf_counter() - start)
+            self.counts[result] += 1
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    """Run main.py under uvicorn in a child process."""
+    command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning"]
+    return subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def get(base_url, path):
+    url = urlsplit(base_url)
+    connection = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        return response.status, response.read().decode()
+    finally:
+        connection.close()
+
+
+def wait_ready(base_url, timeout):
+    """Poll /health until the recognizers are loaded; returns the seconds waited."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            status_code, _ = get(base_url, "/health")
+            if status_code in (200, 404):  # 404: a server without /health
+                return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"Error: {base_url} not ready after {timeout} s")
+
+
+def server_cpu(base_url):
+    """process_cpu_seconds_total from /metrics, or None if the server doesn't export it."""
+    _, text = get(base_url, "/metrics")
+    for line in text.splitlines():
+        if line.startswith("process_cpu_seconds_total "):
+            return float(line.split()[1])
+    return None
+
+
+def run_level(base_url, clients, args, payloads):
+    """Run `clients` simulated kiosks for the configured duration and summarize."""
+    cpu_before = server_cpu(base_url)
+    stop_at = time.perf_counter() + args.duration
+    workers = [Client(base_url, args.endpoint, payloads, args.fps, stop_at, offset=i * 7) for i in range(clients)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    cpu_after = server_cpu(base_url)
+
+    counts = {key: sum(worker.counts[key] for worker in workers) for key in OUTCOMES + ("missed",)}
+    sent = sum(counts[key] for key in OUTCOMES)
+    latencies = [latency for worker in workers for latency in worker.latencies]
+    report = {
+        "clients": clients,
+        "offered_fps": clients * args.fps,
+        "achieved_fps": round(counts["ok"] / args.duration, 2),
+        "latency": percentiles(latencies),
+        "counts": counts,
+        "busy_rate": round(counts["busy"] / sent, 4) if sent else 0.0,
+        "error_rate": round(counts["error"] / sent, 4) if sent else 0.0,
+    }
+    if cpu_before is not None and cpu_after is not None and counts["ok"]:
+        report["server_cpu_ms_per_frame"] = round((cpu_after - cpu_before) / counts["ok"] * 1000, 3)
+    return report
+
+
+def print_report(report):
+    latency = report["latency"]
+    cpu = report.get("server_cpu_ms_per_frame")
+    print(f"{report['clients']:>7} {report['offered_fps']:>8.1f} {report['achieved_fps']:>9.1f} "
+          f"{latency.get('p50', 0):>8.1f} {latency.get('p95', 0):>8.1f} {latency.get('p99', 0):>8.1f} "
+          f"{report['busy_rate']:>6.1%} {report['error_rate']:>6.1%} {report['counts']['missed']:>7} "
+          f"{cpu if cpu is not None else '-':>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate kiosks against the frame service and measure capacity")
+    parser.add_argument("--url", help="server to test, e.g. http://localhost:8000 (default: start main.py locally)")
+    parser.add_argument("--endpoint", choices=["http", "ws", "landmarks"], default="http",
+                        help="/process_frame/, the /ws stream or /process_landmarks/")
+    parser.add_argument("--clients", default="1,2,4,8", help="comma-separated concurrency levels")
+    parser.add_argument("--fps", type=float, default=10, help="frames per second sent by each client")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per concurrency level")
+    parser.add_argument("--frames", help="video file or image directory to replay (synthetic frames by default)")
+    parser.add_argument("--ready-timeout", type=float, default=120, help="seconds to wait for /health")
+    parser.add_argument("--json", help="write the saturation curve to this file")
+    args = parser.parse_args()
+
+    if args.endpoint == "landmarks":
+        payloads = landmark_payloads()
+    else:
+        payloads = load_frames(args.frames) if args.frames else synthetic_frames()
+        if args.endpoint == "http":
+            payloads = [multipart(frame) for frame in payloads]
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        server = start_server(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        print(f"Server ready after {wait_ready(base_url, args.ready_timeout):.1f} s")
+        print("clients  offered  achieved  p50 ms   p95 ms   p99 ms   busy  error  missed  cpu ms/f")
+        curve = []
+        for clients in (int(level) for level in args.clients.split(",")):
+            report = run_level(base_url, clients, args, payloads)
+            print_report(report)
+            curve.append(report)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"url": args.url, "endpoint": args.endpoint, "fps": args.fps, "duration": args.duration,
+                       "levels": curve}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
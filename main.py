@@ -1,17 +1,21 @@
-import mediapipe as mp
-from fastapi import FastAPI, File, UploadFile
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+from fastapi import Depends, FastAPI, File, Header, HTTPException, Request, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-import cv2
-import numpy as np
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-
-app = FastAPI()
-
-# Serve static files (HTML, JS, CSS)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, Field
+from metrics import metrics
+from recognizer_pool import PoolBusy, RecognizerPool, recognize_image_bytes
+from sessions import MAX_GRID_SIZE, SessionStore
+from landmark_gestures import classify_landmarks, parse_landmarks_binary, parse_landmarks_json
+from landmark_classifier import LandmarkClassifier
+from roi import RoiTracker
+from frame_decode import raw_frame_size
+from recognizer_profiles import load_profile, recognizer_options
 
 # Button state
 class ButtonState(BaseModel):
@@ -19,22 +23,88 @@ class ButtonState(BaseModel):
     col: int
     button: str
 
-grid_size = 3
-buttons = [f"Button {i + 1}" for i in range(grid_size * grid_size)]
+# Grid layout requested when a client starts a session
+class SessionConfig(BaseModel):
+    grid_size: int = Field(3, ge=1, le=MAX_GRID_SIZE)
+    buttons: Optional[List[str]] = None
+
+# Navigation state is kept per client session, evicted after it sits idle
+sessions = SessionStore(
+    ttl=float(os.environ.get("GESTURE_SESSION_TTL", "600")),
+    max_sessions=int(os.environ.get("GESTURE_MAX_SESSIONS", "1000")),
+    window=int(os.environ.get("GESTURE_VOTE_WINDOW", "3")),  # A move needs GESTURE_VOTES of the last
+    votes=int(os.environ.get("GESTURE_VOTES", "2")),         # GESTURE_VOTE_WINDOW frames to agree
+)
 
-# Initialize button position and state
-current_position = (0, 0)  # Start with Button 1 (top-left corner)
-current_button = {
-    "row": 0,
-    "col": 0,
-    "button": buttons[0]  # Button 1
+def get_session(x_session_token: Optional[str] = Header(None), session: Optional[str] = None):
+    """Look up the caller's session from the X-Session-Token header or ?session= query."""
+    return sessions.get(x_session_token or session or "default")
+
+# Gesture Recognizer Configuration: a named profile (built in, or defined in GESTURE_PROFILE_FILE) sets
+# num_hands, the confidence thresholds and optionally the model; GESTURE_NUM_HANDS, GESTURE_MIN_*_CONFIDENCE
+# and GESTURE_DELEGATE override single settings
+recognizer_profile_name = os.environ.get("GESTURE_PROFILE", "default")
+recognizer_profile = load_profile(recognizer_profile_name, os.environ.get("GESTURE_PROFILE_FILE"), os.environ)
+gesture_model_path = (os.environ.get("GESTURE_MODEL") or recognizer_profile.get("model")
+                      or "gesture_recognizer.task")  # Update this path if necessary
+
+# Optional trained landmark classifier for /process_landmarks/; the built-in rules are used otherwise
+landmark_model_path = os.environ.get("GESTURE_LANDMARK_MODEL")
+landmark_classifier = LandmarkClassifier.load(landmark_model_path) if landmark_model_path else None
+
+# Labels recorded by data_collect.py mapped to the navigation gestures; labels already named after
+# a navigation gesture (Victory, Pointing_Up, Thumb_Up, Thumb_Down) are used as they are
+CLASSIFIER_GESTURES = {
+    "scrollUP_start": "Thumb_Up",
+    "scrollUP_finish": "Thumb_Up",
+    "scrollDOWN_start": "Thumb_Down",
+    "scrollDOWN_finish": "Thumb_Down",
 }
 
-# Gesture Recognizer Configuration
-gesture_model_path = "gesture_recognizer.task"  # Update this path if necessary
-base_options = python.BaseOptions(model_asset_path=gesture_model_path)
-gesture_recognizer_options = vision.GestureRecognizerOptions(base_options=base_options)
-gesture_recognizer = vision.GestureRecognizer.create_from_options(gesture_recognizer_options)
+# Recognition runs on a pool of workers, each with its own recognizer, so the event loop never blocks.
+# The pool is created at startup and its models load in the background; until they are ready,
+# frames get 503 {"status": "loading"} and /health reports progress.
+pool = None
+
+# JPEG uploads are decoded at 1/2, 1/4 or 1/8 size as long as the longer side stays at least this big
+decode_side = int(os.environ.get("GESTURE_DECODE_SIDE", "640")) or None
+
+# Optional near-duplicate frame cache in the workers, kept per session: frames within GESTURE_CACHE_TOLERANCE
+# mean thumbnail difference of a result recognized less than GESTURE_CACHE_MAX_AGE seconds ago reuse it
+cache_options = None
+if os.environ.get("GESTURE_CACHE", "0") == "1":
+    cache_options = {
+        "max_entries": int(os.environ.get("GESTURE_CACHE_SIZE", "16")),
+        "tolerance": float(os.environ.get("GESTURE_CACHE_TOLERANCE", "2.0")),
+        "max_age": float(os.environ.get("GESTURE_CACHE_MAX_AGE", "0.5")),
+    }
+
+# ROI tracking crops each client's frames to its hand and adapts the input size to a target FPS
+tracking_enabled = os.environ.get("GESTURE_TRACKING", "0") == "1"
+tracking_target_fps = float(os.environ.get("GESTURE_TARGET_FPS", "30"))
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start loading the recognition workers without holding up startup; stop them on shutdown."""
+    global pool
+    pool = RecognizerPool(
+        gesture_model_path,
+        workers=int(os.environ.get("GESTURE_WORKERS", "0")) or None,
+        kind=os.environ.get("GESTURE_WORKER_KIND", "thread"),  # "thread" or "process"
+        queue_size=int(os.environ.get("GESTURE_QUEUE_SIZE", "0")) or None,
+        cache_options=cache_options,
+        recognizer_options=recognizer_options(recognizer_profile),
+    )
+    loading = asyncio.create_task(pool.start())
+    loading.add_done_callback(lambda task: task.cancelled() or task.exception())  # Error is kept in pool.status()
+    yield
+    loading.cancel()
+    pool.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+# Serve static files (HTML, JS, CSS)
+app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.get("/")
 async def serve_frontend():
@@ -42,52 +112,192 @@ async def serve_frontend():
     with open("static/index.html", "r") as f:
         return HTMLResponse(f.read())
 
+@app.post("/session")
+def create_session(config: SessionConfig = SessionConfig()):
+    """Start a navigation session with its own grid and return its token."""
+    try:
+        token, state = sessions.create(grid_size=config.grid_size, buttons=config.buttons)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"session": token, "grid_size": state.grid_size, "buttons": state.buttons,
+            "current_button": state.current_button()}
+
 @app.get("/current_button")
-def get_current_button():
+def get_current_button(state=Depends(get_session)):
     """Get the currently highlighted button."""
-    return current_button
+    return state.current_button()
+
+@app.get("/health")
+def health():
+    """Report whether the recognizers are loaded; 503 while they are still loading."""
+    status = pool.status() if pool is not None else {"status": "loading"}
+    status["profile"] = recognizer_profile_name
+    return JSONResponse(status, status_code=200 if status["status"] == "ready" else 503)
+
+@app.get("/metrics")
+def get_metrics():
+    """Expose per-stage timings and frame counters in Prometheus text format."""
+    text = metrics.render_prometheus()
+    # Standard process CPU counter; loadgen.py divides it by frames served. Recognition in process
+    # workers is spent outside this process, so their CPU is added in.
+    cpu = time.process_time() + (pool.worker_cpu_seconds if pool is not None else 0.0)
+    text += f"# TYPE process_cpu_seconds_total counter\nprocess_cpu_seconds_total {cpu:.6f}\n"
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+async def recognize_and_navigate(contents, state, raw=None):
+    """Recognize the gesture in an encoded frame, or raw pixels described by `raw`, and apply it to the session.
+
+    Returns (status_code, response body); shared by the HTTP and WebSocket endpoints.
+    """
+    metrics.inc("frames_received")
+    if not contents:
+        metrics.inc("frames_dropped", reason="empty")
+        return 200, {"status": "error", "detail": "empty frame", "current_button": state.current_button()}
+    if pool is None or not pool.ready:
+        metrics.inc("frames_dropped", reason="loading")
+        return 503, {"status": "loading", "current_button": state.current_button()}
+
+    tracker = None
+    if tracking_enabled:
+        if state.tracker is None:
+            state.tracker = RoiTracker(target_fps=tracking_target_fps)
+        tracker = state.tracker
+
+    # Decode and recognize on a pool worker; shed load when the queue is full
+    try:
+        if tracker is not None:
+            recognized = await pool.submit(recognize_image_bytes, contents, True, tracker.box,
+                                           tracker.resolution.side, raw, None, state.token)
+        else:
+            recognized = await pool.submit(recognize_image_bytes, contents, False, None,
+                                           recognizer_profile.get("max_side"), raw, decode_side, state.token)
+    except PoolBusy:
+        metrics.inc("frames_dropped", reason="busy")
+        return 503, {"status": "busy", "current_button": state.current_button()}
+    if recognized is None:
+        metrics.inc("frames_dropped", reason="decode")
+        return 200, {"status": "error", "detail": "could not decode image", "current_button": state.current_button()}
+
+    for stage, seconds in recognized["timings"].items():
+        metrics.observe(stage, seconds)
+    if pool.kind == "process":
+        pool.worker_cpu_seconds += recognized["cpu"]
+    if cache_options is not None:
+        metrics.inc("recognition_cache", outcome="hit" if recognized["cached"] else "miss")
+    if tracker is not None:
+        tracker.observe(recognized["box"], recognized["timings"].get("recognize"))
+
+    return 200, navigate(recognized["gestures"], state)
+
+def navigate(gestures, state):
+    """Apply the top gesture of the first hand to the session and build the response."""
+    gesture_name, score = gestures[0] if gestures else (None, 0.0)  # Top gesture
+    if gestures:
+        metrics.inc("frames_with_hands")
+        metrics.inc("gestures", gesture=gesture_name)
+
+    return {"status": "success", "gesture": gesture_name, "current_button": state.apply_gesture(gesture_name, score)}
 
 @app.post("/process_frame/")
-async def process_frame(file: UploadFile = File(...)):
+async def process_frame(file: UploadFile = File(...), state=Depends(get_session)):
     """Process an image frame to detect gestures."""
-    global current_position, current_button
     # Read the uploaded image
     contents = await file.read()
-    np_img = np.frombuffer(contents, np.uint8)
-    frame = cv2.imdecode(np_img, cv2.IMREAD_COLOR)
-
-    # Convert the frame to RGB
-    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-    # Convert to MediaPipe Image format
-    mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-
-    # Perform gesture recognition
-    gesture_results = gesture_recognizer.recognize(mp_image)
-
-    # Gesture handling
-    if gesture_results.gestures:
-        top_gesture = gesture_results.gestures[0][0]  # Top gesture
-        gesture_name = top_gesture.category_name
-
-        row, col = current_position
-
-        # Map gestures to button movements
-        if gesture_name == "Victory" and col < grid_size - 1:  # Move right
-            current_position = (row, col + 1)
-        elif gesture_name == "Pointing_Up" and col > 0:  # Move left
-            current_position = (row, col - 1)
-        elif gesture_name == "Thumb_Up" and row > 0:  # Move up
-            current_position = (row - 1, col)
-        elif gesture_name == "Thumb_Down" and row < grid_size - 1:  # Move down
-            current_position = (row + 1, col)
-
-        # Update the currently highlighted button
-        button_index = current_position[0] * grid_size + current_position[1]
-        current_button = {
-            "row": current_position[0],
-            "col": current_position[1],
-            "button": buttons[button_index],
-        }
-
-    return {"status": "success", "current_button": current_button}
+    status_code, body = await recognize_and_navigate(contents, state)
+    if status_code == 503:
+        return JSONResponse(body, status_code=503, headers={"Retry-After": "1"})
+    return body
+
+@app.post("/process_raw/")
+async def process_raw(request: Request, width: int, height: int, format: str = "rgb", state=Depends(get_session)):
+    """Process raw 8-bit pixels (RGB or grayscale, row-major) of the declared size, skipping image decode."""
+    contents = await request.body()
+    try:
+        expected = raw_frame_size(width, height, format)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if len(contents) != expected:
+        raise HTTPException(status_code=422, detail=f"expected {expected} bytes for {width}x{height} {format}")
+    status_code, body = await recognize_and_navigate(contents, state, (width, height, format))
+    if status_code == 503:
+        return JSONResponse(body, status_code=503, headers={"Retry-After": "1"})
+    return body
+
+@app.post("/process_landmarks/")
+async def process_landmarks(request: Request, state=Depends(get_session)):
+    """Classify hand landmarks computed by the client, without uploading an image.
+
+    Accepts JSON ({"hands": [[[x, y, z] * 21], ...]}) or packed little-endian
+    float32 values (21 x 3 per hand) as application/octet-stream.
+    """
+    body = await request.body()
+    metrics.inc("landmark_frames_received")
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            hands = parse_landmarks_json(json.loads(body))
+        else:
+            hands = parse_landmarks_binary(body)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    with metrics.timer("classify"):
+        if landmark_classifier is not None:
+            labels, scores = landmark_classifier.predict_batch(hands)
+            gestures = [(CLASSIFIER_GESTURES.get(label, label), score) for label, score in zip(labels, scores.tolist())]
+        else:
+            gestures = classify_landmarks(hands)
+    return navigate(gestures, state)
+
+@app.websocket("/ws")
+async def stream_frames(websocket: WebSocket, session: Optional[str] = None):
+    """Receive encoded frames over one connection and push gesture and button updates back.
+
+    Only the newest unprocessed frame is kept; frames that arrive while
+    recognition is behind replace it and are counted as dropped.
+    """
+    await websocket.accept()
+    token = session or "default"
+    latest = {"frame": None}
+    frame_ready = asyncio.Event()
+
+    async def receive_frames():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            contents = message.get("bytes")
+            if contents is None:
+                metrics.inc("frames_dropped", reason="text")
+                await websocket.send_json({"status": "error", "detail": "frames must be sent as binary messages"})
+                continue
+            if latest["frame"] is not None:
+                metrics.inc("frames_dropped", reason="stale")
+            latest["frame"] = contents
+            frame_ready.set()
+
+    async def process_frames():
+        while True:
+            await frame_ready.wait()
+            frame_ready.clear()
+            contents, latest["frame"] = latest["frame"], None
+            # Looking the session up per frame keeps it from idling out while streaming
+            state = sessions.get(token)
+            try:
+                _, body = await recognize_and_navigate(contents, state)
+            except Exception as e:
+                # One bad frame must not close the stream
+                metrics.inc("frames_dropped", reason="error")
+                body = {"status": "error", "detail": str(e) or type(e).__name__,
+                        "current_button": state.current_button()}
+            await websocket.send_json(body)
+
+    tasks = [asyncio.create_task(receive_frames()), asyncio.create_task(process_frames())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
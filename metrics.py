@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RingHistogram:
+    """Fixed-size ring buffer of the most recent durations for one stage."""
+
+    def __init__(self, size=1024):
+        self.samples = np.zeros(size, dtype=np.float64)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self.samples[self.count % len(self.samples)] = seconds
+        self.count += 1
+        self.total += seconds
+
+    def quantiles(self, quantiles=QUANTILES):
+        """Return {quantile: seconds} over the samples still in the buffer."""
+        filled = min(self.count, len(self.samples))
+        if not filled:
+            return {}
+        return dict(zip(quantiles, np.quantile(self.samples[:filled], quantiles)))
+
+
+class _NullTimer:
+    """Timer handed out while metrics are disabled; does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """Per-stage timing histograms and counters for the recognition hot path.
+
+    Use `with metrics.timer("recognize"):` around a stage and
+    `metrics.inc("frames_received")` for counters. When disabled, timer()
+    returns a shared no-op context and inc()/observe() return immediately.
+    """
+
+    def __init__(self, enabled=True, size=1024):
+        self.enabled = enabled
+        self.size = size
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+
+    def timer(self, stage):
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = RingHistogram(self.size)
+            histogram.observe(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def snapshot(self):
+        """Return stage quantiles (in ms) and counter values as plain dicts."""
+        with self._lock:
+            stages = {
+                stage: {f"p{int(q * 100)}": round(value * 1000, 2) for q, value in histogram.quantiles().items()}
+                for stage, histogram in self._histograms.items()
+            }
+            counters = {
+                name + "".join(f"[{value}]" for _, value in labels): count
+                for (name, labels), count in self._counters.items()
+            }
+        return {"stages": stages, "counters": counters}
+
+    def render_prometheus(self, prefix="gesture"):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            if self._histograms:
+                name = f"{prefix}_stage_seconds"
+                lines.append(f"# TYPE {name} summary")
+                for stage, histogram in sorted(self._histograms.items()):
+                    for q, value in histogram.quantiles().items():
+                        lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value:.6f}')
+                    lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.total:.6f}')
+                    lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+
+            typed = set()
+            for (counter, labels), count in sorted(self._counters.items()):
+                name = f"{prefix}_{counter}_total"
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                lines.append(f"{name}{{{label_text}}} {count}" if label_text else f"{name} {count}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared instance; set GESTURE_METRICS=0 to disable instrumentation
+metrics = Metrics(enabled=os.environ.get("GESTURE_METRICS", "1") != "0")
@@ -0,0 +1,196 @@
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from metrics import metrics
+from recognition import create_recognizer, to_mp_image
+
+
+class LatestQueue:
+    """Bounded queue where a new item pushes out the oldest one when full."""
+
+    def __init__(self, maxsize=1):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def put(self, item):
+        """Add an item, dropping the oldest queued item if there is no room."""
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def get(self, timeout=None):
+        """Return the next item, or None if nothing arrives before the timeout."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class GesturePipeline:
+    """Capture, recognition and actuation running as separate stages.
+
+    The capture stage always keeps only the newest frame, the recognizer runs
+    in LIVE_STREAM mode with at most one inference in flight, and results are
+    handed to `on_result(result, rgb_frame, captured_at)` on an actuation
+    thread. Because stale frames are dropped instead of queued,
+    capture-to-action latency is bounded by one inference rather than by the
+    sum of all stages. An optional `gate(rgb_frame)` can skip frames before
+    they reach the recognizer. When `live` is False (a recorded clip or image
+    directory), the first failed read ends capture; the other stages drain
+    and then set `finished`.
+    """
+
+    def __init__(self, read_frame, on_result, model_path, queue_size=1, inference_timeout=1.0, gate=None,
+                 options=None, live=True):
+        self.read_frame = read_frame
+        self.live = live
+        self.on_result = on_result
+        self.gate = gate
+        self.inference_timeout = inference_timeout
+
+        # Bounded queues between the stages
+        self.frames = LatestQueue(queue_size)
+        self.results = LatestQueue(queue_size)
+
+        # Counters reported by stats()
+        self.captured = 0
+        self.failed_reads = 0
+        self.recognized = 0
+        self.inference_timeouts = 0
+        self.late_results = 0  # Results that arrived after their inference timed out, discarded
+        self.actuated = 0
+        self.latencies = deque(maxlen=500)
+
+        self.running = False
+        self.finished = threading.Event()  # Set once a non-live source is exhausted and drained
+        self._capture_done = False
+        self._inference_done = False
+        self._threads = []
+        self._idle = threading.Event()  # Set while no inference is in flight
+        self._idle.set()
+        self._in_flight = None  # (timestamp_ms, rgb_frame, captured_at, submitted_at) of the pending inference
+        self._last_timestamp_ms = 0
+
+        self.recognizer = create_recognizer(model_path, "LIVE_STREAM", self._on_recognized, **(options or {}))
+
+    def start(self):
+        """Start the capture, recognition and actuation threads."""
+        self.running = True
+        for target in (self._capture_loop, self._inference_loop, self._actuation_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop all stages and release the recognizer."""
+        self.running = False
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+        self.recognizer.close()
+
+    def stats(self):
+        """Return frame counts and drops for each stage."""
+        latencies = sorted(self.latencies)
+        return {
+            "captured": self.captured,
+            "failed_reads": self.failed_reads,
+            "capture_dropped": self.frames.dropped,
+            "recognized": self.recognized,
+            "inference_timeouts": self.inference_timeouts,
+            "late_results": self.late_results,
+            "actuation_dropped": self.results.dropped,
+            "actuated": self.actuated,
+            "latency_ms_p50": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            "latency_ms_max": round(latencies[-1] * 1000, 1) if latencies else None,
+        }
+
+    def _capture_loop(self):
+        while self.running:
+            ret, frame = self.read_frame()
+            if not ret:
+                if not self.live:  # End of a recorded clip
+                    self._capture_done = True
+                    return
+                self.failed_reads += 1
+                time.sleep(0.01)
+                continue
+            metrics.inc("frames_received")
+
+            with metrics.timer("prepare"):
+                frame = cv2.flip(frame, 1)
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if self.gate is not None and not self.gate(rgb_frame):
+                continue
+
+            dropped = self.frames.dropped
+            self.frames.put((rgb_frame, time.perf_counter()))
+            self.captured += 1
+            if self.frames.dropped != dropped:
+                metrics.inc("frames_dropped", stage="capture")
+
+    def _inference_loop(self):
+        while self.running:
+            # Keep only one inference in flight so frames never queue up inside the graph. Waiting before
+            # taking a frame means the frame submitted is the newest one, not one held during the wait.
+            if not self._idle.wait(timeout=self.inference_timeout):
+                self.inference_timeouts += 1
+                self._in_flight = None  # Give up on it; its result is discarded if it still arrives
+                self._idle.set()
+
+            item = self.frames.get(timeout=0.1)
+            if item is None:
+                if self._capture_done:
+                    # The wait above let the last inference finish, so nothing more is coming
+                    self._inference_done = True
+                    return
+                continue
+
+            # LIVE_STREAM mode needs strictly increasing timestamps
+            timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+            self._last_timestamp_ms = timestamp_ms
+
+            self._idle.clear()
+            self._in_flight = (timestamp_ms, item[0], item[1], time.perf_counter())
+            mp_image = to_mp_image(item[0])
+            self.recognizer.recognize_async(mp_image, timestamp_ms)
+
+    def _on_recognized(self, result, output_image, timestamp_ms):
+        in_flight = self._in_flight
+        if in_flight is None or in_flight[0] != timestamp_ms:
+            self.late_results += 1  # Belongs to an inference that timed out; its frame is gone
+            return
+        _, rgb_frame, captured_at, submitted_at = in_flight
+        metrics.observe("recognize", time.perf_counter() - submitted_at)
+        self.recognized += 1
+
+        dropped = self.results.dropped
+        self.results.put((result, rgb_frame, captured_at))
+        if self.results.dropped != dropped:
+            metrics.inc("frames_dropped", stage="actuation")
+        self._idle.set()
+
+    def _actuation_loop(self):
+        while self.running:
+            item = self.results.get(timeout=0.1)
+            if item is None:
+                if self._inference_done:
+                    self.finished.set()
+                    return
+                continue
+
+            result, rgb_frame, captured_at = item
+            self.on_result(result, rgb_frame, captured_at)
+            self.latencies.append(time.perf_counter() - captured_at)
+            self.actuated += 1
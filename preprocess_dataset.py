@@ -0,0 +1,160 @@
+"""Extract hand landmarks from a gesture_images/<label>/*.jpg tree, with a cache.
+
+    python preprocess_dataset.py gesture_images -o gesture_landmarks
+
+Landmarks are cached in a memory-mapped store keyed by a hash of each file's
+contents, so later runs only run hand detection on new or changed images.
+The output is a landmark dataset directory (see landmark_dataset.py) that
+landmark_classifier.py trains on.
+"""
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from landmark_dataset import NUM_LANDMARKS, save_dataset
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# Bytes per cached (21, 3) float32 row
+ROW_BYTES = NUM_LANDMARKS * 3 * 4
+
+# Each worker process keeps its own hand detector here
+_hands = None
+
+
+class LandmarkCache:
+    """Append-only (hash -> landmarks) store backed by a memory-mapped float32 file.
+
+    Rows are NaN for images in which no hand was found, so those are not
+    processed again either.
+    """
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.landmarks_path = os.path.join(directory, "landmarks.f32")
+        self.hashes_path = os.path.join(directory, "hashes.txt")
+        self.rows = {}
+        text = ""
+        hashes = []
+        if os.path.exists(self.hashes_path):
+            with open(self.hashes_path, encoding="ascii") as f:
+                text = f.read()
+            hashes = text.splitlines()
+            if text and not text.endswith("\n"):
+                hashes.pop()  # A hash cut short by an interrupted run
+        stored = os.path.getsize(self.landmarks_path) // ROW_BYTES if os.path.exists(self.landmarks_path) else 0
+
+        # The two files are flushed separately, so after an interrupted run either may be ahead.
+        # Cut both back to the rows they agree on, so appended rows line up with their hashes again.
+        kept = min(stored, len(hashes))
+        if os.path.exists(self.landmarks_path) and os.path.getsize(self.landmarks_path) != kept * ROW_BYTES:
+            os.truncate(self.landmarks_path, kept * ROW_BYTES)
+        if len(hashes) != kept or (text and not text.endswith("\n")):
+            with open(self.hashes_path, "w", encoding="ascii") as f:
+                f.writelines(digest + "\n" for digest in hashes[:kept])
+        self.rows = {digest: row for row, digest in enumerate(hashes[:kept])}
+
+    def __contains__(self, digest):
+        return digest in self.rows
+
+    def add(self, items):
+        """Append (hash, (21, 3) landmarks or None) pairs."""
+        with open(self.landmarks_path, "ab") as landmarks, open(self.hashes_path, "a", encoding="ascii") as hashes:
+            for digest, points in items:
+                if points is None:
+                    points = np.full((NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+                landmarks.write(np.asarray(points, dtype=np.float32).tobytes())
+                hashes.write(digest + "\n")
+                self.rows[digest] = len(self.rows)
+
+    def lookup(self, digests):
+        """Return the (n, 21, 3) landmarks for cached hashes, read through a memory map."""
+        if not self.rows:
+            return np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)
+        store = np.memmap(self.landmarks_path, dtype=np.float32, mode="r").reshape(-1, NUM_LANDMARKS, 3)
+        return np.asarray(store[[self.rows[digest] for digest in digests]])
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def find_images(root):
+    """Return (path, label) for every image under root/<label>/."""
+    images = []
+    for label in sorted(os.listdir(root)):
+        label_dir = os.path.join(root, label)
+        if not os.path.isdir(label_dir) or label.startswith("."):
+            continue
+        for name in sorted(os.listdir(label_dir)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                images.append((os.path.join(label_dir, name), label))
+    return images
+
+
+def _init_worker():
+    global _hands
+    import mediapipe as mp
+    _hands = mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=1)
+
+
+def extract_landmarks(path):
+    """Return the (21, 3) landmarks of the first hand in an image, or None."""
+    import cv2
+    frame = cv2.imread(path)
+    if frame is None:
+        return None
+    result = _hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    if not result.multi_hand_landmarks:
+        return None
+    return np.array([(lm.x, lm.y, lm.z) for lm in result.multi_hand_landmarks[0].landmark], dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract landmarks from a labelled image tree, reusing cached results")
+    parser.add_argument("images", nargs="?", default="gesture_images", help="directory with one folder per label")
+    parser.add_argument("-o", "--output", default="gesture_landmarks", help="landmark dataset directory to write")
+    parser.add_argument("--cache", help="cache directory (default: <images>/.landmark_cache)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="extraction processes")
+    args = parser.parse_args()
+
+    cache = LandmarkCache(args.cache or os.path.join(args.images, ".landmark_cache"))
+    images = find_images(args.images)
+
+    start = time.perf_counter()
+    digests = [file_hash(path) for path, _ in images]
+    hash_seconds = time.perf_counter() - start
+
+    # Identical files only need to be processed once
+    pending = {}
+    for (path, _), digest in zip(images, digests):
+        if digest not in cache and digest not in pending:
+            pending[digest] = path
+
+    start = time.perf_counter()
+    if pending:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as executor:
+            results = executor.map(extract_landmarks, pending.values(), chunksize=16)
+            cache.add(zip(pending, results))
+    extract_seconds = time.perf_counter() - start
+
+    hands = cache.lookup(digests)
+    found = ~np.isnan(hands).any(axis=(1, 2))
+    save_dataset(args.output, hands[found], [label for (_, label), keep in zip(images, found) if keep])
+
+    print(f"{len(images)} images: {len(images) - len(pending)} cached, {len(pending)} extracted, "
+          f"{int((~found).sum())} without a hand")
+    print(f"Hashing: {hash_seconds:.2f} s ({len(images) / max(hash_seconds, 1e-9):.0f} images/s)")
+    if pending:
+        print(f"Extraction: {extract_seconds:.2f} s ({len(pending) / extract_seconds:.1f} images/s "
+              f"on {args.workers} workers)")
+    print(f"Wrote {int(found.sum())} samples to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
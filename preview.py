@@ -0,0 +1,97 @@
+import queue
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+class PreviewBridge:
+    """Pass camera frames and UI updates from a worker thread to the Tk main loop.
+
+    Tk is not thread-safe, so worker threads only publish the latest frame,
+    label text and queued UI calls. The main loop applies them with
+    `root.after` at no more than `fps` times per second, drawing into a single
+    canvas item. Frames are resized into preallocated buffers, and the image
+    pasted into Tk has the PhotoImage's own mode, so no conversion runs.
+    """
+
+    def __init__(self, root, canvas, label_var, size=(200, 150), fps=15):
+        self.root = root
+        self.canvas = canvas
+        self.label_var = label_var
+        self.size = size
+        self.interval_ms = max(1, int(1000 / fps))
+
+        self._lock = threading.Lock()
+        self._frame = None
+        self._label = None
+        self._shown_label = label_var.get()
+        self._events = queue.SimpleQueue()
+        self._running = False
+
+        # Preallocated buffers; the PIL image shares memory with the RGBA array and has the
+        # same mode as the PhotoImage, so paste() copies without converting
+        width, height = size
+        self._rgb = np.empty((height, width, 3), dtype=np.uint8)
+        self._rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        self._image = Image.frombuffer("RGBA", size, self._rgba, "raw", "RGBA", 0, 1)
+        self._photo = ImageTk.PhotoImage("RGBA", size)
+        self._item = canvas.create_image(0, 0, anchor="nw", image=self._photo)
+
+    def publish_frame(self, rgb_frame):
+        """Offer a new frame for display; only the latest one is kept."""
+        with self._lock:
+            self._frame = rgb_frame
+
+    def set_label(self, text):
+        """Set the gesture label text shown on the next refresh."""
+        with self._lock:
+            self._label = text
+
+    def post(self, func, *args):
+        """Queue a Tk call to run on the main thread."""
+        self._events.put((func, args))
+
+    def start(self):
+        self._running = True
+        self.root.after(self.interval_ms, self._refresh)
+
+    def stop(self):
+        self._running = False
+
+    def _refresh(self):
+        if not self._running:
+            return
+        try:
+            self._apply_updates()
+        finally:
+            # Keep refreshing even if an update failed, or the preview would freeze for good
+            self.root.after(self.interval_ms, self._refresh)
+
+    def _apply_updates(self):
+        # Run queued UI calls from the worker thread
+        while True:
+            try:
+                func, args = self._events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"UI update {getattr(func, '__name__', func)} failed: {e!r}")
+
+        with self._lock:
+            frame, self._frame = self._frame, None
+            label = self._label
+
+        # Touch the label only when its text actually changes
+        if label is not None and label != self._shown_label:
+            self.label_var.set(label)
+            self._shown_label = label
+
+        # Update the existing canvas image in place
+        if frame is not None:
+            cv2.resize(frame, self.size, dst=self._rgb)
+            cv2.cvtColor(self._rgb, cv2.COLOR_RGB2RGBA, dst=self._rgba)
+            self._photo.paste(self._image)
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import numpy as np
+
+# mediapipe takes about a second to import, so it is only imported once a
+# recognizer is actually built; this keeps UI and server startup fast.
+
+
+def create_recognizer(model_path, running_mode=None, result_callback=None, num_hands=None,
+                      min_hand_detection_confidence=None, min_hand_presence_confidence=None,
+                      min_tracking_confidence=None, delegate=None):
+    """Create a GestureRecognizer for the given .task bundle.
+
+    `running_mode` is a vision.RunningMode or its name, e.g. "LIVE_STREAM",
+    and `delegate` is "CPU" or "GPU". Settings left as None keep mediapipe's
+    defaults; recognizer_profiles.py bundles them into named profiles.
+    """
+    from mediapipe.tasks.python import BaseOptions
+    from mediapipe.tasks.python import vision
+
+    if isinstance(running_mode, str):
+        running_mode = vision.RunningMode[running_mode]
+    base_options = BaseOptions(model_asset_path=model_path)
+    if delegate is not None:
+        base_options.delegate = BaseOptions.Delegate[delegate.upper()]
+    options = vision.GestureRecognizerOptions(base_options=base_options)
+    if running_mode is not None:
+        options.running_mode = running_mode
+    settings = {"num_hands": num_hands, "min_hand_detection_confidence": min_hand_detection_confidence,
+                "min_hand_presence_confidence": min_hand_presence_confidence,
+                "min_tracking_confidence": min_tracking_confidence}
+    for name, value in settings.items():
+        if value is not None:
+            setattr(options, name, value)
+    if result_callback is not None:
+        options.result_callback = result_callback
+    return vision.GestureRecognizer.create_from_options(options)
+
+
+def to_mp_image(rgb_frame):
+    """Wrap an RGB frame as a mediapipe Image."""
+    import mediapipe as mp
+    return mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+
+
+def recognize_rgb(recognizer, rgb_frame):
+    """Run one IMAGE-mode recognizer pass over an RGB frame."""
+    return recognizer.recognize(to_mp_image(rgb_frame))
+
+
+def warm_up(recognizer, size=(480, 640), passes=2):
+    """Run inference on a synthetic frame so the first real frame doesn't pay the cold start.
+
+    Returns the seconds taken by the first pass.
+    """
+    frame = np.full((size[0], size[1], 3), 128, dtype=np.uint8)
+    start = time.perf_counter()
+    recognize_rgb(recognizer, frame)
+    first_pass = time.perf_counter() - start
+    for _ in range(passes - 1):
+        recognize_rgb(recognizer, frame)
+    return first_pass
+
+
+class LazyRecognizer:
+    """Build and warm up an IMAGE-mode recognizer on a background thread.
+
+    status() reports "idle", "loading", "ready" or "error" so callers can
+    show progress instead of blocking; get() returns the recognizer, or
+    None while it is still loading. `options` are create_recognizer()
+    settings such as num_hands.
+    """
+
+    def __init__(self, model_path, warm=True, options=None):
+        self.model_path = model_path
+        self.warm = warm
+        self.options = options or {}
+        self.state = "idle"
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self._recognizer = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin loading in the background; does nothing if already started."""
+        with self._lock:
+            if self.state != "idle":
+                return self
+            self.state = "loading"
+        threading.Thread(target=self._load, daemon=True).start()
+        return self
+
+    def _load(self):
+        try:
+            start = time.perf_counter()
+            recognizer = create_recognizer(self.model_path, **self.options)
+            self.load_seconds = time.perf_counter() - start
+            if self.warm:
+                self.warmup_seconds = warm_up(recognizer)
+        except Exception as e:
+            self.error = str(e)
+            self.state = "error"
+        else:
+            self._recognizer = recognizer
+            self.state = "ready"
+        self._ready.set()
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def get(self, timeout=0):
+        """Return the recognizer, waiting up to `timeout` seconds (None waits until loaded)."""
+        self.start()
+        self._ready.wait(timeout)
+        return self._recognizer
+
+    def status(self):
+        return {"status": self.state, "error": self.error,
+                "load_seconds": self.load_seconds, "warmup_seconds": self.warmup_seconds}
+
+
+def hands_from_result(result):
+    """Convert a GestureRecognizerResult into a list of (gesture, score, landmarks).
+
+    Landmarks are a (21, 3) array of normalized coordinates taken from the
+    same result, so no second hand model is needed.
+    """
+    hands = []
+    for i, hand_landmarks in enumerate(result.hand_landmarks):
+        if i < len(result.gestures) and result.gestures[i]:
+            gesture, score = result.gestures[i][0].category_name, result.gestures[i][0].score
+        else:
+            gesture, score = None, 0.0
+        points = np.array([(lm.x, lm.y, lm.z) for lm in hand_landmarks], dtype=np.float32)
+        hands.append((gesture, score, points))
+    return hands
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class RecognitionCache:
+    """Reuse recognizer results for frames that look almost the same as a recent one.
+
+    Frames are compared by a tiny grayscale thumbnail: a frame whose mean
+    pixel difference to a cached thumbnail is at most `tolerance` gets that
+    entry's result. Entries are dropped `max_age` seconds after they were
+    recognized, so a still scene is still re-recognized regularly, and the
+    least recently used entry goes once `max_entries` is reached. Safe to
+    share between threads.
+    """
+
+    def __init__(self, max_entries=16, tolerance=2.0, max_age=0.5, size=(16, 12)):
+        self.max_entries = max_entries
+        self.tolerance = tolerance
+        self.max_age = max_age
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (thumbnail, result, recognized_at)
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def fingerprint(self, rgb_frame):
+        # Subsampling first keeps the area resize cheap on full-size frames
+        step = max(1, min(rgb_frame.shape[1] // (self.size[0] * 4), rgb_frame.shape[0] // (self.size[1] * 4)))
+        small = cv2.resize(rgb_frame[::step, ::step], self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_RGB2GRAY).astype(np.int16)
+
+    def get(self, rgb_frame):
+        """Return (cached result or None, fingerprint); pass the fingerprint to put() on a miss."""
+        thumbnail = self.fingerprint(rgb_frame)
+        now = time.monotonic()
+        with self._lock:
+            # Newest entries first; a still scene matches the last one
+            for key in reversed(list(self._entries)):
+                cached, result, recognized_at = self._entries[key]
+                if now - recognized_at > self.max_age:
+                    del self._entries[key]
+                    continue
+                if np.abs(thumbnail - cached).mean() <= self.tolerance:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result, thumbnail
+            self.misses += 1
+        return None, thumbnail
+
+    def put(self, thumbnail, result):
+        with self._lock:
+            self._entries[self._next_key] = (thumbnail, result, time.monotonic())
+            self._next_key += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
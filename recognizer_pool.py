@@ -0,0 +1,173 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from frame_decode import FrameDecoder
+from recognition import create_recognizer, hands_from_result, recognize_rgb, warm_up
+from recognition_cache import RecognitionCache
+from roi import crop_to_box, downscale, next_box, to_full_frame
+
+# Each worker thread or process keeps its own recognizer here
+_worker = threading.local()
+
+# Near-duplicate frame caches, one per client session, shared by the worker threads of a process.
+# Keeping them apart stops one kiosk's frame from getting another's result.
+_cache_options = None
+_caches = OrderedDict()
+_cache_lock = threading.Lock()
+MAX_SESSION_CACHES = 1024
+
+
+class PoolBusy(Exception):
+    """Raised when the pool's submission queue is full."""
+
+
+def _init_worker(model_path, cache_options=None, recognizer_options=None):
+    global _cache_options
+    _worker.recognizer = create_recognizer(model_path, **(recognizer_options or {}))
+    _worker.decoder = FrameDecoder()
+    warm_up(_worker.recognizer)
+    _cache_options = cache_options
+
+
+def _session_cache(session):
+    """Return the session's RecognitionCache, or None when caching is off."""
+    if _cache_options is None:
+        return None
+    with _cache_lock:
+        cache = _caches.get(session)
+        if cache is None:
+            cache = _caches[session] = RecognitionCache(**_cache_options)
+            while len(_caches) > MAX_SESSION_CACHES:
+                _caches.popitem(last=False)
+        else:
+            _caches.move_to_end(session)
+        return cache
+
+
+def _worker_ready():
+    # Runs once the worker's initializer has loaded and warmed up its recognizer
+    return True
+
+
+def recognize_image_bytes(contents, track=False, box=None, max_side=None, raw=None, decode_side=None,
+                          session=None):
+    """Decode an uploaded frame and recognize gestures in it.
+
+    Runs inside a pool worker. `contents` is an encoded image, or raw pixels
+    when `raw` gives (width, height, "rgb" or "gray"). Encoded JPEGs are
+    decoded at reduced size when their longer side exceeds `decode_side`.
+    Returns None if the image cannot be decoded, otherwise a plain dict (so
+    it can cross process boundaries) with the top (gesture, score) of each
+    hand and the time spent in each stage. With `track`, recognition runs on
+    the `box` crop downscaled to `max_side`, and the result carries the
+    search box for the session's next frame; otherwise `max_side`, if set,
+    limits the whole frame. When the frame matches a recent
+    one from the same `session` in the worker's cache, that result is reused
+    and "cached" is True. "cpu" is the worker CPU time the call took.
+    """
+    cpu_start = time.process_time()
+    t0 = time.perf_counter()
+    if raw is not None:
+        rgb_frame = _worker.decoder.from_raw(contents, *raw)
+    else:
+        if track:
+            # The crop, not the whole frame, has to keep max_side pixels
+            extent = max(box[2] - box[0], box[3] - box[1]) if box is not None else 1.0
+            decode_side = int(max_side / extent) if max_side else None
+        elif max_side:
+            decode_side = min(decode_side or max_side, max_side)
+        rgb_frame = _worker.decoder.decode(contents, decode_side)
+        if rgb_frame is None:
+            return None
+    t2 = time.perf_counter()
+    if track:
+        crop, box = crop_to_box(rgb_frame, box)
+        rgb_frame = np.ascontiguousarray(downscale(crop, max_side))
+    elif max_side:
+        rgb_frame = downscale(rgb_frame, max_side)
+    t3 = time.perf_counter()
+    cache = _session_cache(session)
+    result, fingerprint = cache.get(rgb_frame) if cache is not None else (None, None)
+    cached = result is not None
+    if not cached:
+        result = recognize_rgb(_worker.recognizer, rgb_frame)
+        if cache is not None:
+            cache.put(fingerprint, result)
+    t4 = time.perf_counter()
+
+    recognized = {
+        "gestures": [(hand[0].category_name, hand[0].score) for hand in result.gestures if hand],
+        "timings": {"decode": t2 - t0, ("cache_hit" if cached else "recognize"): t4 - t3},
+        "cached": cached,
+        "cpu": time.process_time() - cpu_start,
+    }
+    if track:
+        recognized["timings"]["crop"] = t3 - t2
+        recognized["box"] = next_box([to_full_frame(points, box) for _, _, points in hands_from_result(result)])
+    return recognized
+
+
+class RecognizerPool:
+    """Worker pool where every worker owns a recognizer, behind a bounded queue.
+
+    `kind` is "thread" or "process". At most `queue_size` jobs may be queued
+    or running at once; submit() raises PoolBusy instead of waiting when the
+    queue is full, so callers can shed load immediately. Workers load their
+    models when first used; start() loads them all up front and sets `ready`.
+    """
+
+    def __init__(self, model_path, workers=None, kind="thread", queue_size=None, cache_options=None,
+                 recognizer_options=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.kind = kind
+        self.queue_size = queue_size or self.workers * 2
+
+        executor_class = ProcessPoolExecutor if kind == "process" else ThreadPoolExecutor
+        self.executor = executor_class(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(model_path, cache_options, recognizer_options))
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self.rejected = 0
+        self.ready = False
+        self.error = None
+        self.load_seconds = None
+        self.worker_cpu_seconds = 0.0  # CPU spent by process workers, which the server's own CPU time misses
+
+    async def start(self):
+        """Spin up every worker, loading and warming up its recognizer, then mark the pool ready."""
+        started = time.perf_counter()
+        try:
+            # Submitting one job per worker at once makes the executor start all of them
+            await asyncio.gather(*(asyncio.wrap_future(self.executor.submit(_worker_ready))
+                                   for _ in range(self.workers)))
+        except Exception as e:
+            self.error = str(e)
+            raise
+        self.load_seconds = time.perf_counter() - started
+        self.ready = True
+
+    def status(self):
+        state = "ready" if self.ready else "error" if self.error else "loading"
+        return {"status": state, "error": self.error, "load_seconds": self.load_seconds,
+                "workers": self.workers, "kind": self.kind}
+
+    async def submit(self, func, *args):
+        """Run func(*args) on a worker and await its result."""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PoolBusy()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,221 @@
+"""Named recognizer settings, and a benchmark to choose between them.
+
+A profile is a dict of create_recognizer() settings plus an optional
+"model" (.task bundle) and "max_side", the longest frame side passed to the
+recognizer (frames are shrunk to it first). Built-in profiles can be extended or overridden with
+a JSON file of {"name": {settings}} entries:
+
+    {"kiosk": {"model": "custom_gestures_lite.task", "num_hands": 1,
+               "min_hand_detection_confidence": 0.6}}
+
+The benchmark replays a clip through each profile and reports FPS against
+how often a hand was detected, then picks the fastest profile that still
+detects hands in at least --min-detection of the frames:
+
+    python recognizer_profiles.py clips/kiosk.mp4 --profile-file kiosk.json --json profiles.json
+"""
+import argparse
+import json
+import time
+
+import cv2
+
+from benchmark import percentiles
+from frame_source import open_source
+from roi import downscale
+
+PROFILES = {
+    # mediapipe's defaults: one hand, 0.5 for every confidence threshold
+    "default": {},
+    # Frames shrunk to 320 px before recognition, so conversion and the model's own resize handle a
+    # quarter of the pixels of 640x480; hands far from the camera may be missed. With tracking
+    # (app.py --pipelined, or the benchmark's --video), the low tracking threshold also re-runs palm
+    # detection less often.
+    "low-latency": {"num_hands": 1, "max_side": 320, "min_tracking_confidence": 0.3},
+    # Two hands and stricter thresholds: fewer false detections, re-detects as soon as tracking weakens
+    "accurate-two-hand": {"num_hands": 2, "min_hand_detection_confidence": 0.7,
+                          "min_hand_presence_confidence": 0.7, "min_tracking_confidence": 0.7},
+}
+
+# Setting name -> type; anything else in a profile is a mistake
+SETTINGS = {
+    "model": str,
+    "max_side": int,
+    "num_hands": int,
+    "min_hand_detection_confidence": float,
+    "min_hand_presence_confidence": float,
+    "min_tracking_confidence": float,
+    "delegate": str,
+}
+
+# Environment variables that override single settings of the selected profile
+ENV_SETTINGS = {
+    "GESTURE_NUM_HANDS": "num_hands",
+    "GESTURE_MAX_SIDE": "max_side",
+    "GESTURE_MIN_DETECTION_CONFIDENCE": "min_hand_detection_confidence",
+    "GESTURE_MIN_PRESENCE_CONFIDENCE": "min_hand_presence_confidence",
+    "GESTURE_MIN_TRACKING_CONFIDENCE": "min_tracking_confidence",
+    "GESTURE_DELEGATE": "delegate",
+}
+
+
+def check_profile(name, profile):
+    """Raise ValueError for unknown settings or values of the wrong type."""
+    for key, value in profile.items():
+        if key not in SETTINGS:
+            raise ValueError(f"profile {name!r}: unknown setting {key!r}; use one of {sorted(SETTINGS)}")
+        expected = SETTINGS[key]
+        numeric = expected is float and isinstance(value, int)  # JSON writes 1.0 as 1
+        if isinstance(value, bool) or not (isinstance(value, expected) or numeric):
+            raise ValueError(f"profile {name!r}: {key} must be a {expected.__name__}")
+
+
+def load_profiles(path=None):
+    """Return the built-in profiles, updated with those defined in the JSON file at `path`."""
+    profiles = {name: dict(profile) for name, profile in PROFILES.items()}
+    if path:
+        with open(path, encoding="utf-8") as f:
+            defined = json.load(f)
+        if not isinstance(defined, dict):
+            raise ValueError(f"{path}: expected an object of named profiles")
+        for name, profile in defined.items():
+            if not isinstance(profile, dict):
+                raise ValueError(f"{path}: profile {name!r} must be an object")
+            check_profile(name, profile)
+            profiles[name] = {key: SETTINGS[key](value) for key, value in profile.items()}
+    return profiles
+
+
+def load_profile(name=None, path=None, environ=None):
+    """Return a copy of the named profile ("default" if None), with overrides from `environ` applied."""
+    profiles = load_profiles(path)
+    name = name or "default"
+    if name not in profiles:
+        raise ValueError(f"unknown recognizer profile {name!r}; use one of {sorted(profiles)}")
+    profile = dict(profiles[name])
+    for variable, key in ENV_SETTINGS.items():
+        if environ and environ.get(variable):
+            profile[key] = SETTINGS[key](environ[variable])
+    return profile
+
+
+# Profile settings applied to frames or the model file rather than passed to create_recognizer()
+FRAME_SETTINGS = ("model", "max_side")
+
+
+def recognizer_options(profile):
+    """The create_recognizer() keyword arguments of a profile (everything except the model and frame size)."""
+    return {key: value for key, value in profile.items() if key not in FRAME_SETTINGS}
+
+
+def run_profile(name, profile, clip, model, video=False, limit=None):
+    """Replay a clip through one profile and return its report."""
+    from recognition import create_recognizer, hands_from_result, to_mp_image, warm_up
+
+    model = profile.get("model") or model
+    started = time.perf_counter()
+    recognizer = create_recognizer(model, "VIDEO" if video else None, **recognizer_options(profile))
+    load_seconds = time.perf_counter() - started
+    if not video:
+        warm_up(recognizer)  # VIDEO mode needs increasing timestamps, so its first frame is dropped instead
+
+    source = open_source(clip)
+    if not source.isOpened():
+        raise SystemExit(f"Error: could not open {clip}")
+    latencies = []
+    detected = gestures = hands_seen = 0
+    frames = 0
+    while limit is None or frames < limit:
+        ret, frame = source.read()
+        if not ret:
+            break
+        rgb_frame = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+
+        start = time.perf_counter()
+        rgb_frame = downscale(rgb_frame, profile.get("max_side"))  # Part of the profile's cost
+        if video:
+            result = recognizer.recognize_for_video(to_mp_image(rgb_frame), int(frames * 1000 / source.fps))
+        else:
+            result = recognizer.recognize(to_mp_image(rgb_frame))
+        seconds = time.perf_counter() - start
+        frames += 1
+        if video and frames == 1:
+            continue
+
+        hands = hands_from_result(result)
+        latencies.append(seconds)
+        hands_seen += len(hands)
+        detected += bool(hands)
+        gestures += any(gesture not in (None, "None") for gesture, _, _ in hands)
+    source.release()
+    recognizer.close()
+
+    measured = len(latencies)
+    total = sum(latencies)
+    return {
+        "profile": name,
+        "settings": profile,
+        "model": model,
+        "frames": measured,
+        "load_seconds": round(load_seconds, 3),
+        "fps": round(measured / total, 2) if total else 0.0,
+        "latency": percentiles(latencies),
+        "detection_rate": round(detected / measured, 4) if measured else 0.0,
+        "gesture_rate": round(gestures / measured, 4) if measured else 0.0,
+        "hands_per_frame": round(hands_seen / measured, 3) if measured else 0.0,
+    }
+
+
+def pick_profile(reports, min_detection=None):
+    """Fastest profile whose detection rate is at least `min_detection`.
+
+    Without a threshold, profiles must reach 95% of the best detection rate.
+    """
+    if not reports:
+        return None
+    if min_detection is None:
+        min_detection = 0.95 * max(report["detection_rate"] for report in reports)
+    eligible = [report for report in reports if report["detection_rate"] >= min_detection]
+    return max(eligible, key=lambda report: report["fps"]) if eligible else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recognizer profiles on a replay clip")
+    parser.add_argument("clip", help="video file or directory of images")
+    parser.add_argument("--model", default="custom_gestures.task", help="model for profiles that don't name one")
+    parser.add_argument("--profile-file", help="JSON file with more profiles")
+    parser.add_argument("--profiles", help="comma-separated profiles to run (default: all)")
+    parser.add_argument("--video", action="store_true",
+                        help="recognize in VIDEO mode, where hands are tracked between frames as in the live app")
+    parser.add_argument("--limit", type=int, help="stop each run after this many frames")
+    parser.add_argument("--min-detection", type=float,
+                        help="detection rate a profile must reach to be picked (default: 95%% of the best)")
+    parser.add_argument("--json", help="write the reports to this file")
+    args = parser.parse_args()
+
+    profiles = load_profiles(args.profile_file)
+    names = args.profiles.split(",") if args.profiles else list(profiles)
+    unknown = [name for name in names if name not in profiles]
+    if unknown:
+        raise SystemExit(f"Error: unknown profiles {unknown}; use one of {sorted(profiles)}")
+
+    reports = []
+    for name in names:
+        report = run_profile(name, profiles[name], args.clip, args.model, args.video, args.limit)
+        latency = report["latency"]
+        print(f"{name:<20} {report['fps']:8.1f} FPS  p95 {latency.get('p95', 0.0):7.2f} ms  "
+              f"detected {report['detection_rate']:6.1%}  gestures {report['gesture_rate']:6.1%}  "
+              f"hands/frame {report['hands_per_frame']:.2f}")
+        reports.append(report)
+
+    best = pick_profile(reports, args.min_detection)
+    print(f"Fastest profile meeting the detection target: {best['profile'] if best else 'none'}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"clip": args.clip, "video": args.video, "profiles": reports,
+                       "picked": best["profile"] if best else None}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
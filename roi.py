@@ -0,0 +1,139 @@
+import cv2
+import numpy as np
+
+
+def hand_bbox(points, width, height, padding=20):
+    """Padded pixel box (x_min, y_min, x_max, y_max) around normalized landmarks."""
+    xs = points[:, 0] * width
+    ys = points[:, 1] * height
+    x_min = max(0, int(xs.min()) - padding)
+    y_min = max(0, int(ys.min()) - padding)
+    x_max = min(width, int(xs.max()) + padding)
+    y_max = min(height, int(ys.max()) + padding)
+    return x_min, y_min, x_max, y_max
+
+
+def next_box(hands_points, margin=0.5, min_size=0.25):
+    """Normalized search box (x0, y0, x1, y1) for the next frame, or None to search the full frame.
+
+    The box covers every hand, grown by `margin` times its size on each side
+    so the hand can move between frames, and is at least `min_size` wide and tall.
+    """
+    if not hands_points:
+        return None
+    points = np.concatenate([p[:, :2] for p in hands_points])
+    x0, y0 = points.min(axis=0)
+    x1, y1 = points.max(axis=0)
+    grow_x = max((x1 - x0) * (1 + 2 * margin), min_size) / 2
+    grow_y = max((y1 - y0) * (1 + 2 * margin), min_size) / 2
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    box = (max(0.0, cx - grow_x), max(0.0, cy - grow_y), min(1.0, cx + grow_x), min(1.0, cy + grow_y))
+    # Tracking is pointless when the box is almost the whole frame
+    if (box[2] - box[0]) * (box[3] - box[1]) > 0.8:
+        return None
+    return tuple(float(v) for v in box)
+
+
+def crop_to_box(frame, box):
+    """Crop a frame to a normalized box; returns (crop, pixel-aligned normalized box)."""
+    if box is None:
+        return frame, (0.0, 0.0, 1.0, 1.0)
+    height, width = frame.shape[:2]
+    x0, y0 = int(box[0] * width), int(box[1] * height)
+    x1, y1 = max(x0 + 1, int(box[2] * width)), max(y0 + 1, int(box[3] * height))
+    return frame[y0:y1, x0:x1], (x0 / width, y0 / height, x1 / width, y1 / height)
+
+
+def to_full_frame(points, box):
+    """Map (21, 3) landmarks normalized to a crop back to full-frame coordinates."""
+    x0, y0, x1, y1 = box
+    mapped = points.copy()
+    mapped[:, 0] = x0 + points[:, 0] * (x1 - x0)
+    mapped[:, 1] = y0 + points[:, 1] * (y1 - y0)
+    mapped[:, 2] = points[:, 2] * (x1 - x0)
+    return mapped
+
+
+def downscale(frame, max_side):
+    """Shrink a frame so its longer side is at most max_side pixels."""
+    height, width = frame.shape[:2]
+    longest = max(height, width)
+    if not max_side or longest <= max_side:
+        return frame
+    scale = max_side / longest
+    return cv2.resize(frame, (max(1, int(width * scale)), max(1, int(height * scale))),
+                      interpolation=cv2.INTER_AREA)
+
+
+class AdaptiveResolution:
+    """Choose the recognizer input size from measured inference time and a target FPS.
+
+    The longest input side shrinks while inference is over the frame budget
+    and grows back when there is headroom, between min_side and max_side.
+    """
+
+    def __init__(self, target_fps=30, min_side=192, max_side=640, smoothing=0.2, settle_frames=10):
+        self.budget = 1.0 / target_fps
+        self.min_side = min_side
+        self.max_side = max_side
+        self.smoothing = smoothing
+        self.settle_frames = settle_frames
+        self.side = max_side
+        self.average = None
+        self._since_change = 0
+
+    def update(self, inference_seconds):
+        if self.average is None:
+            self.average = inference_seconds
+        else:
+            self.average += self.smoothing * (inference_seconds - self.average)
+
+        # Let the average settle on the new size before changing it again
+        self._since_change += 1
+        if self._since_change < self.settle_frames:
+            return
+
+        if self.average > self.budget * 1.1 and self.side > self.min_side:
+            self.side = max(self.min_side, int(self.side * 0.85))
+            self._since_change = 0
+        elif self.average < self.budget * 0.6 and self.side < self.max_side:
+            self.side = min(self.max_side, int(self.side * 1.15))
+            self._since_change = 0
+
+
+class RoiTracker:
+    """Track the hand between frames and feed the recognizer a small crop.
+
+    prepare() crops the frame to the box found around the hands in the
+    previous frame (or keeps the full frame when the hand was lost) and
+    downscales it to the adaptive input size. finish() maps the landmarks
+    back to full-frame coordinates and updates the box and the input size.
+    """
+
+    def __init__(self, target_fps=30, min_side=192, max_side=640, margin=0.5):
+        self.resolution = AdaptiveResolution(target_fps, min_side, max_side)
+        self.margin = margin
+        self.box = None
+        self.full_frame_searches = 0
+
+    def prepare(self, rgb_frame):
+        """Return (recognizer input, crop box) for a full RGB frame."""
+        if self.box is None:
+            self.full_frame_searches += 1
+        crop, box = crop_to_box(rgb_frame, self.box)
+        return np.ascontiguousarray(downscale(crop, self.resolution.side)), box
+
+    def finish(self, hands, box, inference_seconds):
+        """Map (gesture, score, points) hands from crop to frame coordinates and update tracking."""
+        hands = [(gesture, score, to_full_frame(points, box)) for gesture, score, points in hands]
+        self.observe(next_box([points for _, _, points in hands], self.margin), inference_seconds)
+        return hands
+
+    def observe(self, box, inference_seconds):
+        """Record the next search box and the inference time, e.g. as reported by a pool worker.
+
+        Pass None as the time for results that came from a cache.
+        """
+        if inference_seconds is not None:
+            self.resolution.update(inference_seconds)
+        self.box = box
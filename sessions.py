@@ -0,0 +1,131 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from dispatch import Action, GestureDispatcher
+
+# Gesture -> grid move table; a held gesture moves again at most every 0.8 s
+NAVIGATION_ACTIONS = {
+    "Victory": Action("right", repeat=0.8),
+    "Pointing_Up": Action("left", repeat=0.8),
+    "Thumb_Up": Action("up", repeat=0.8),
+    "Thumb_Down": Action("down", repeat=0.8),
+}
+
+# Largest grid a client may ask for
+MAX_GRID_SIZE = 10
+
+# Row and column change for each move
+MOVES = {
+    "right": (0, 1),
+    "left": (0, -1),
+    "up": (-1, 0),
+    "down": (1, 0),
+}
+
+
+class NavigationState:
+    """Highlighted-button position on one client's button grid."""
+
+    __slots__ = ("grid_size", "buttons", "row", "col", "last_seen", "lock", "tracker", "dispatcher", "token")
+
+    def __init__(self, grid_size=3, buttons=None, window=3, votes=2):
+        if not 1 <= grid_size <= MAX_GRID_SIZE:
+            raise ValueError(f"grid_size must be between 1 and {MAX_GRID_SIZE}")
+        if buttons is None:
+            buttons = [f"Button {i + 1}" for i in range(grid_size * grid_size)]
+        if len(buttons) != grid_size * grid_size:
+            raise ValueError(f"expected {grid_size * grid_size} buttons for a {grid_size}x{grid_size} grid")
+        self.grid_size = grid_size
+        self.buttons = buttons
+        self.row = 0  # Start with Button 1 (top-left corner)
+        self.col = 0
+        self.last_seen = time.monotonic()
+        self.lock = threading.Lock()
+        self.tracker = None  # ROI tracking state for this client's camera, when enabled
+        self.token = None  # Set by SessionStore; keys per-session state kept in the recognizer workers
+        self.dispatcher = GestureDispatcher(NAVIGATION_ACTIONS, window=window, votes=votes)
+
+    def current_button(self):
+        """Return the currently highlighted button."""
+        with self.lock:
+            return self._button()
+
+    def apply_gesture(self, gesture_name, score=1.0):
+        """Feed one frame's top gesture (None when no hand) and return the highlighted button.
+
+        Gestures go through the session's dispatcher, so a move needs a few
+        agreeing frames and a held gesture repeats at a limited rate.
+        """
+        with self.lock:
+            for move, steps in self.dispatcher.update(gesture_name, score):
+                d_row, d_col = MOVES[move]
+                self.row = min(max(self.row + d_row * steps, 0), self.grid_size - 1)
+                self.col = min(max(self.col + d_col * steps, 0), self.grid_size - 1)
+            return self._button()
+
+    def _button(self):
+        return {
+            "row": self.row,
+            "col": self.col,
+            "button": self.buttons[self.row * self.grid_size + self.col],
+        }
+
+
+class SessionStore:
+    """In-memory sessions keyed by client token, with idle TTL and a size cap.
+
+    Sessions are kept in least-recently-used order, so expired sessions are
+    always at the front and the oldest one is evicted when the cap is hit.
+    """
+
+    def __init__(self, ttl=600.0, max_sessions=1000, **defaults):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.defaults = defaults  # NavigationState settings used unless a session overrides them
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, **config):
+        """Start a new session and return (token, state)."""
+        token = uuid.uuid4().hex
+        state = NavigationState(**{**self.defaults, **config})
+        with self._lock:
+            self._insert(token, state, time.monotonic())
+        return token, state
+
+    def get(self, token):
+        """Return the session for token, starting a default one if it is unknown or expired."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            state = self._sessions.get(token)
+            if state is None:
+                state = NavigationState(**self.defaults)
+                self._insert(token, state, now)
+            else:
+                self._sessions.move_to_end(token)
+                state.last_seen = now
+            return state
+
+    def _insert(self, token, state, now):
+        self._evict_expired(now)
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        state.last_seen = now
+        state.token = token
+        self._sessions[token] = state
+
+    def _evict_expired(self, now):
+        while self._sessions:
+            token, state = next(iter(self._sessions.items()))
+            if now - state.last_seen < self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted += 1
@@ -0,0 +1,110 @@
+"""Measure how long a cold process takes to produce its first recognized frame.
+
+Every run starts a fresh interpreter and times each step on the way to the
+first frame: importing the heavy modules, loading the model, the warm-up
+pass and the first real frame, followed by steady-state frames:
+
+    python startup_benchmark.py --model custom_gestures.task --runs 5
+    python startup_benchmark.py --frame sample.jpg --no-warmup --json startup.json
+"""
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+STEPS = ("process", "imports", "load", "warmup", "first_frame", "steady_frame", "total_to_first_frame")
+STEADY_FRAMES = 10
+
+
+def measure(model_path, modules, frame_path=None, warm=True):
+    """Time the startup steps in this process; returns seconds per step."""
+    timings = {}
+    start = time.perf_counter()
+    for name in modules:
+        importlib.import_module(name)
+    timings["imports"] = time.perf_counter() - start
+
+    from recognition import create_recognizer, recognize_rgb, warm_up
+
+    start = time.perf_counter()
+    recognizer = create_recognizer(model_path)
+    timings["load"] = time.perf_counter() - start
+
+    if warm:
+        start = time.perf_counter()
+        warm_up(recognizer)
+        timings["warmup"] = time.perf_counter() - start
+
+    if frame_path:
+        import cv2
+        frame = cv2.cvtColor(cv2.imread(frame_path), cv2.COLOR_BGR2RGB)
+    else:
+        frame = np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8)
+
+    start = time.perf_counter()
+    recognize_rgb(recognizer, frame)
+    timings["first_frame"] = time.perf_counter() - start
+
+    samples = []
+    for _ in range(STEADY_FRAMES):
+        start = time.perf_counter()
+        recognize_rgb(recognizer, frame)
+        samples.append(time.perf_counter() - start)
+    timings["steady_frame"] = float(np.median(samples))
+    recognizer.close()
+    return timings
+
+
+def run_fresh(args):
+    """Run one measurement in a new interpreter; adds the wall time to the first frame."""
+    command = [sys.executable, __file__, "--child", "--model", args.model, "--modules", args.modules]
+    if args.frame:
+        command += ["--frame", args.frame]
+    if args.no_warmup:
+        command.append("--no-warmup")
+    start = time.perf_counter()
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    wall = time.perf_counter() - start
+    timings = json.loads(output.strip().splitlines()[-1])
+    # Approximate: the steady-state frames ran after the first frame, so take them off the wall time
+    timings["total_to_first_frame"] = wall - timings["steady_frame"] * STEADY_FRAMES
+    # Interpreter startup and everything else outside the measured steps
+    timings["process"] = timings["total_to_first_frame"] - sum(
+        timings.get(step, 0.0) for step in ("imports", "load", "warmup", "first_frame"))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import, model load and first-frame latency from a cold start")
+    parser.add_argument("--model", default="custom_gestures.task", help="gesture recognizer .task bundle")
+    parser.add_argument("--modules", default="cv2,mediapipe",
+                        help="comma-separated modules imported before loading, in order")
+    parser.add_argument("--frame", help="image used as the first real frame (random noise by default)")
+    parser.add_argument("--no-warmup", action="store_true", help="skip the synthetic warm-up pass")
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes to measure")
+    parser.add_argument("--json", help="write every run to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        timings = measure(args.model, [m for m in args.modules.split(",") if m], args.frame, not args.no_warmup)
+        print(json.dumps(timings))
+        return
+
+    runs = [run_fresh(args) for _ in range(args.runs)]
+    for step in STEPS:
+        samples = [run[step] * 1000 for run in runs if step in run]
+        if samples:
+            print(f"{step:<22} median {np.median(samples):9.1f} ms  max {max(samples):9.1f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"model": args.model, "warmup": not args.no_warmup, "runs": runs}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
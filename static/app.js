@@ -134,6 +134,62 @@ import {
   
   let lastVideoTime = -1;
   let results = undefined;
+
+  // Send detected landmarks to the backend instead of whole frames
+  const landmarkEndpoint = "/process_landmarks/";
+  const landmarkIntervalMs = 100;
+  let lastLandmarkSend = 0;
+
+  // Each page gets its own navigation session on the server, started on the first send
+  let sessionToken = null;
+  let sessionRequest = null;
+
+  function getSession() {
+    if (!sessionRequest) {
+      sessionRequest = fetch("/session", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({}),
+      })
+        .then((response) => response.json())
+        .then((data) => {
+          sessionToken = data.session;
+          return sessionToken;
+        })
+        .catch((error) => {
+          sessionRequest = null; // Try again on the next send
+          throw error;
+        });
+    }
+    return sessionRequest;
+  }
+
+  async function sendLandmarks(hands) {
+    const now = performance.now();
+    if (hands.length === 0 || now - lastLandmarkSend < landmarkIntervalMs) {
+      return;
+    }
+    lastLandmarkSend = now;
+
+    // Pack 21 x 3 float32 values per hand
+    const packed = new Float32Array(hands.length * 21 * 3);
+    hands.forEach((hand, h) => {
+      hand.forEach((point, i) => {
+        packed.set([point.x, point.y, point.z], (h * 21 + i) * 3);
+      });
+    });
+
+    try {
+      const token = sessionToken || (await getSession());
+      await fetch(landmarkEndpoint, {
+        method: "POST",
+        headers: { "Content-Type": "application/octet-stream", "X-Session-Token": token },
+        body: packed.buffer,
+      });
+    } catch (error) {
+      console.error("Error sending landmarks:", error);
+    }
+  }
   
   // Predict landmarks in webcam feed
   async function predictWebcam() {
@@ -150,6 +206,7 @@ import {
     if (lastVideoTime !== video.currentTime) {
       lastVideoTime = video.currentTime;
       results = handLandmarker.detectForVideo(video, startTimeMs);
+      sendLandmarks(results.landmarks);
     }
   
     // Clear previous drawings
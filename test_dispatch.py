@@ -0,0 +1,97 @@
+from dispatch import Action, GestureDispatcher
+
+
+def dispatcher(**action_options):
+    return GestureDispatcher({"s": Action("scroll", **action_options), "c": Action("click")}, window=3, votes=2)
+
+
+def test_needs_enough_votes():
+    d = dispatcher()
+    assert d.update("c", now=0.0) == []
+    assert d.update("c", now=0.1) == [("click", 1)]
+    assert d.active == "c"
+
+
+def test_single_frame_misclassification_never_fires():
+    d = dispatcher()
+    assert d.update("c", now=0.0) == []
+    assert d.update(None, now=0.1) == []
+    assert d.update("s", now=0.2) == []
+    assert d.active is None
+
+
+def test_low_score_counts_as_no_gesture():
+    d = dispatcher(min_score=0.8)
+    assert d.update("s", 0.5, now=0.0) == []
+    assert d.update("s", 0.5, now=0.1) == []
+    assert d.active is None
+
+
+def test_held_gesture_fires_once_without_repeat():
+    d = dispatcher()
+    d.update("c", now=0.0)
+    assert d.update("c", now=0.1) == [("click", 1)]
+    assert d.update("c", now=5.0) == []
+
+
+def test_repeat_is_rate_limited():
+    d = dispatcher(repeat=0.5)
+    d.update("s", now=0.0)
+    assert d.update("s", now=0.1) == [("scroll", 1)]
+    assert d.update("s", now=0.3) == []
+    assert d.update("s", now=0.6) == [("scroll", 1)]
+
+
+def test_continuous_fires_every_frame():
+    d = dispatcher(continuous=True)
+    d.update("s", now=0.0)
+    assert d.update("s", now=0.1) == [("scroll", 1)]
+    assert d.update("s", now=0.11) == [("scroll", 1)]
+
+
+def test_coalesce_counts_held_frames():
+    d = dispatcher(repeat=0.5, coalesce=True)
+    d.update("s", now=0.0)
+    assert d.update("s", now=0.1) == [("scroll", 1)]
+    assert d.update("s", now=0.2) == []
+    assert d.update("s", now=0.3) == []
+    assert d.update("s", now=0.6) == [("scroll", 3)]
+
+
+def test_coalesce_never_fires_zero_steps():
+    d = dispatcher(repeat=0.15, coalesce=True)
+    d.update("s", now=0.0)
+    assert d.update("s", now=0.1) == [("scroll", 1)]
+    # Still voted in, but this frame was not counted, so there is nothing to send yet
+    assert d.update(None, now=0.3) == []
+    assert d.update("s", now=0.35) == [("scroll", 1)]
+
+
+def test_flush_on_gesture_end():
+    d = dispatcher(repeat=1.0, coalesce=True)
+    d.update("s", now=0.0)
+    assert d.update("s", now=0.1) == [("scroll", 1)]
+    d.update("s", now=0.2)
+    d.update("s", now=0.3)
+    d.update(None, now=0.4)
+    assert d.update(None, now=0.5) == [("scroll", 2)]
+    assert d.active is None
+
+
+def test_flush_then_start_on_switch():
+    d = dispatcher(repeat=1.0, coalesce=True)
+    d.update("s", now=0.0)
+    d.update("s", now=0.1)
+    d.update("s", now=0.2)
+    d.update("c", now=0.3)
+    assert d.update("c", now=0.4) == [("scroll", 1), ("click", 1)]
+
+
+def test_reset_drops_pending_steps():
+    d = dispatcher(repeat=1.0, coalesce=True)
+    d.update("s", now=0.0)
+    d.update("s", now=0.1)
+    d.update("s", now=0.2)
+    d.reset()
+    assert d.update(None, now=0.3) == []
+    assert d.active is None